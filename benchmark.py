@@ -0,0 +1,209 @@
+"""Benchmark EmailAnalyzer on deterministic synthetic Substack exports
+
+Generates exports of the requested sizes (cached in --data-dir), then times load_data,
+the shared analysis pass, every analyze_* method and generate_report, each size in a
+fresh process so peak RSS is measured per size. Results are printed as a table and can
+be written as JSON to track regressions:
+
+    python benchmark.py --rows 10k,1M --json bench.json
+"""
+
+import argparse
+import contextlib
+import csv
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+import email_subscriber_analysis as esa
+
+
+DEFAULT_ROWS = '10k,1M,10M'
+DEFAULT_DATA_DIR = '.email_analysis_bench'
+
+# Share of subscribers drawn from each domain category
+DEFAULT_DOMAIN_MIX = {
+    'fortune_100': 0.10,
+    'edu': 0.10,
+    'gov': 0.05,
+    'media': 0.05,
+    'philanthropy': 0.05,
+    'other': 0.65,
+}
+DOMAIN_POOLS = {
+    'fortune_100': sorted(esa.FORTUNE_100_EMAILS),
+    'edu': sorted(esa.PROMINENT_EDU_EMAILS) + ['@umich.edu', '@cs.stanford.edu', '@smallcollege.edu'],
+    'gov': sorted(esa.STATE_GOV_EMAILS) + ['@nasa.gov', '@usda.gov', '@x.senate.gov', '@cityofboston.gov'],
+    'media': sorted(esa.MEDIA_EMAILS),
+    'philanthropy': sorted(esa.ALL_PHILANTHROPY_EMAILS) + ['@localfoodbank.org'],
+    'other': ['@gmail.com', '@yahoo.com', '@hotmail.com', '@outlook.com', '@icloud.com', '@proton.me'],
+}
+
+# Date formats Substack exports have used, by name
+DATE_FORMATS = {
+    'iso': lambda d: d.strftime('%Y-%m-%dT%H:%M:%S.') + f"{d.microsecond // 1000:03d}Z",
+    'datetime': lambda d: d.strftime('%Y-%m-%d %H:%M:%S'),
+    'date': lambda d: d.strftime('%Y-%m-%d'),
+    'us-date': lambda d: d.strftime('%m/%d/%Y'),
+    'us-datetime': lambda d: d.strftime('%m/%d/%Y %H:%M:%S'),
+}
+
+# Other columns of an "export all columns" download, used to pad rows to --columns
+FILLER_COLUMNS = ['Name', 'Stripe plan', 'Cancel date', 'Country', 'Source', 'Subscription type',
+                  'Comments', 'Shares', 'Posts viewed', 'Days active (last 30 days)', 'Notes']
+
+SECTIONS = ['analyze_basic_stats', 'analyze_subscription_age', 'analyze_open_rates',
+            'analyze_open_rates_by_age', 'analyze_open_rates_by_age_all', 'analyze_zero_receives_by_age',
+            'analyze_edu_emails', 'analyze_corporation_emails', 'analyze_vc_startup_emails',
+            'analyze_government_emails', 'analyze_media_emails', 'analyze_org_emails', 'analyze_open_rate_distribution',
+            'analyze_age_histograms']
+
+
+def parse_count(text: str) -> int:
+    """Parse a row count such as 10000, 10k or 1M"""
+    text = text.strip().lower()
+    scale = {'k': 10 ** 3, 'm': 10 ** 6}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def parse_mix(text: str) -> dict:
+    """Parse a domain mix such as edu=0.2,gov=0.1 on top of the defaults"""
+    mix = dict(DEFAULT_DOMAIN_MIX)
+    for item in filter(None, text.split(',')):
+        category, _, share = item.partition('=')
+        if category not in DOMAIN_POOLS:
+            raise argparse.ArgumentTypeError(f"unknown domain category {category!r}")
+        mix[category] = float(share)
+    return mix
+
+
+def generate_export(path: str, rows: int, columns: int = 10, domain_mix: dict = None,
+                    date_format: str = 'iso', blank_last_opened: float = 0.3, seed: int = 0,
+                    now: datetime = datetime(2025, 6, 1)):
+    """Write a synthetic export; the same arguments always produce the same file"""
+    rng = random.Random(seed)
+    mix = domain_mix or DEFAULT_DOMAIN_MIX
+    categories = list(mix)
+    weights = [mix[category] for category in categories]
+    formats = list(DATE_FORMATS.values()) if date_format == 'mixed' else [DATE_FORMATS[date_format]]
+    fillers = (FILLER_COLUMNS + [f"Extra column {i}" for i in range(max(columns - 5, 0))])[:max(columns - 5, 0)]
+    header = [esa.EMAIL_COLUMN] + fillers[:1] + [esa.SUBSCRIPTION_DATE_COLUMN, esa.LAST_OPENED_COLUMN,
+                                                 esa.RECEIVES_COLUMN, esa.OPENS_COLUMN] + fillers[1:]
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i in range(rows):
+            domain = rng.choice(DOMAIN_POOLS[rng.choices(categories, weights)[0]])
+            fmt = rng.choice(formats)
+            subscribed = now - timedelta(days=rng.randint(0, 3000), seconds=rng.randint(0, 86399))
+            received = rng.choice((0, rng.randint(1, 26)))
+            opened = rng.randint(0, received)
+            if rng.random() < blank_last_opened:
+                last_opened = ''
+            else:
+                last_opened = fmt(min(subscribed + timedelta(days=rng.randint(0, 3000)), now))
+            row = [f"reader{i}{domain}"]
+            if fillers:
+                row.append(f"Reader {i}")
+            row += [fmt(subscribed), last_opened, str(received), str(opened)]
+            row.extend('free' if name == 'Stripe plan' else '' for name in fillers[1:])
+            writer.writerow(row)
+    return header
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB, or None where unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_benchmark(path: str, rows: int, years_back: int = 6) -> dict:
+    """Time every stage of one export; meant to run in a fresh process"""
+    stages = {}
+
+    def timed(name, func, *args):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func(*args)
+        seconds = time.perf_counter() - start
+        stages[name] = {'seconds': round(seconds, 6), 'rows_per_sec': round(rows / seconds) if seconds else None}
+
+    analyzer = esa.EmailAnalyzer(path, years_back)
+    timed('load_data', analyzer.load_data)
+    timed('analyze', analyzer.analyze)
+    for section in SECTIONS:
+        timed(section, getattr(analyzer, section))
+    with tempfile.TemporaryDirectory() as directory:
+        timed('generate_report', esa.EmailAnalyzer(path, years_back).generate_report,
+              os.path.join(directory, 'report.txt'))
+    return {'stages': stages, 'peak_rss_mb': peak_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the email subscriber analysis on synthetic exports")
+    parser.add_argument('--rows', default=DEFAULT_ROWS,
+                        help=f"Comma-separated export sizes, with k/M suffixes (default: {DEFAULT_ROWS})")
+    parser.add_argument('--columns', type=int, default=10,
+                        help="Columns per export, at least the 5 the analysis reads (default: 10)")
+    parser.add_argument('--domain-mix', type=parse_mix, default=DEFAULT_DOMAIN_MIX, metavar='CATEGORY=SHARE,...',
+                        help=f"Relative shares of {', '.join(DOMAIN_POOLS)} (default: "
+                             f"{','.join(f'{k}={v}' for k, v in DEFAULT_DOMAIN_MIX.items())})")
+    parser.add_argument('--date-format', choices=list(DATE_FORMATS) + ['mixed'], default='iso',
+                        help="Date format of the date columns; mixed picks one per row (default: iso)")
+    parser.add_argument('--blank-last-opened', type=float, default=0.3, metavar='SHARE',
+                        help="Share of blank \"Email last opened at\" values (default: 0.3)")
+    parser.add_argument('--seed', type=int, default=0, help="Generator seed (default: 0)")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR,
+                        help=f"Where generated exports are kept between runs (default: {DEFAULT_DATA_DIR})")
+    parser.add_argument('--json', metavar='FILE', help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    settings = {'columns': args.columns, 'domain_mix': args.domain_mix, 'date_format': args.date_format,
+                'blank_last_opened': args.blank_last_opened, 'seed': args.seed}
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+    for rows in map(parse_count, args.rows.split(',')):
+        # Exports are named after their settings so changing any of them regenerates the file
+        name = hashlib.blake2b(json.dumps([rows, settings], sort_keys=True).encode(), digest_size=6).hexdigest()
+        path = os.path.join(args.data_dir, f"export_{rows}_{name}.csv")
+        if not os.path.exists(path):
+            print(f"Generating {rows:,} rows into {path}...", file=sys.stderr)
+            generate_export(path + '.tmp', rows, **settings)
+            os.replace(path + '.tmp', path)
+        print(f"Benchmarking {rows:,} rows...", file=sys.stderr)
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            result = pool.submit(run_benchmark, path, rows).result()
+        results.append({'rows': rows, 'file_bytes': os.path.getsize(path), **result})
+
+        print(f"\n{rows:,} rows ({os.path.getsize(path) / (1 << 20):.1f} MB), peak RSS "
+              f"{result['peak_rss_mb'] or 0:.1f} MB")
+        for stage, timing in result['stages'].items():
+            print(f"  {stage:32} {timing['seconds']:10.4f}s {timing['rows_per_sec'] or 0:>14,} rows/s")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(),
+                       'date': datetime.now().isoformat(timespec='seconds'), 'settings': settings,
+                       'results': results}, f, indent=2)
+        print(f"\nResults saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
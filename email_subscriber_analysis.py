@@ -4,12 +4,43 @@ Email Subscriber Analysis Script
 Analyzes email subscriber data from CSV and produces a comprehensive report
 """
 
+import calendar
 import csv
 import re
-from datetime import datetime, timedelta
-from collections import defaultdict, Counter
-from typing import Dict, List, Tuple, Set
+import sqlite3
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from fractions import Fraction
+from collections import defaultdict, deque, Counter
+from itertools import chain, combinations, compress, islice, repeat
+from operator import add, eq, floordiv, ge, gt, itemgetter, mod, ne, not_, or_, sub
+from typing import Dict, List, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; profiles then omit memory
+    resource = None
+try:
+    import yaml
+except ImportError:  # Optional; category files can be CSV or JSON instead
+    yaml = None
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import math
+import mmap
+import os
+import pickle
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, reduce, wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
 
 # Email domain configurations
 PROMINENT_EDU_EMAILS = {
@@ -172,24 +203,105 @@ ALL_PHILANTHROPY_EMAILS = {
 }
 
 
-class EmailAnalyzer:
-    def __init__(self, csv_file: str, years_back: int = 6):
-        self.csv_file = csv_file
-        self.years_back = years_back
-        self.subscribers = []
-        self.current_date = datetime.now()
-        
-    def load_data(self):
-        """Load subscriber data from CSV file"""
-        with open(self.csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                self.subscribers.append(row)
-    
-    def parse_date(self, date_str: str) -> datetime:
-        """Parse date string to datetime object"""
-        if not date_str or date_str.strip() == '':
-            return None
+# Columns of the Substack export used by the analysis
+EMAIL_COLUMN = 'Email'
+SUBSCRIPTION_DATE_COLUMN = 'Subscription date'
+LAST_OPENED_COLUMN = 'Email last opened at'
+RECEIVES_COLUMN = 'Email receives (last 6 months)'
+OPENS_COLUMN = 'Emails opened (last 6 months)'
+ANALYSIS_COLUMNS = (EMAIL_COLUMN, SUBSCRIPTION_DATE_COLUMN, LAST_OPENED_COLUMN, RECEIVES_COLUMN, OPENS_COLUMN)
+
+# Report sections in report order, with the CSV columns each one reads
+SECTION_COLUMNS = {
+    'basic_stats': (LAST_OPENED_COLUMN, RECEIVES_COLUMN, OPENS_COLUMN),
+    'subscription_age': (SUBSCRIPTION_DATE_COLUMN,),
+    'age_histograms': (SUBSCRIPTION_DATE_COLUMN,),
+    'open_rates': (RECEIVES_COLUMN, OPENS_COLUMN),
+    'open_rates_by_age': (SUBSCRIPTION_DATE_COLUMN, RECEIVES_COLUMN, OPENS_COLUMN),
+    'open_rates_by_age_all': (SUBSCRIPTION_DATE_COLUMN, RECEIVES_COLUMN, OPENS_COLUMN),
+    'zero_receives_by_age': (SUBSCRIPTION_DATE_COLUMN, RECEIVES_COLUMN),
+    'open_rate_distribution': (EMAIL_COLUMN, SUBSCRIPTION_DATE_COLUMN, RECEIVES_COLUMN, OPENS_COLUMN),
+    'edu_emails': (EMAIL_COLUMN, LAST_OPENED_COLUMN),
+    'corporation_emails': (EMAIL_COLUMN, LAST_OPENED_COLUMN),
+    'vc_startup_emails': (EMAIL_COLUMN, LAST_OPENED_COLUMN),
+    'government_emails': (EMAIL_COLUMN, LAST_OPENED_COLUMN),
+    'media_emails': (EMAIL_COLUMN, LAST_OPENED_COLUMN),
+    'org_emails': (EMAIL_COLUMN, LAST_OPENED_COLUMN),
+    'custom_categories': (EMAIL_COLUMN, LAST_OPENED_COLUMN),
+}
+
+# Percentiles of the open rate reported per age bucket and per category
+OPEN_RATE_PERCENTILES = (10, 50, 90)
+
+# Per-subscriber scores (--scores): columns, and the engagement score's points out of 100 for
+# the 6-month open rate and for recency, which falls to 0 for last opens SCORE_RECENCY_DAYS ago
+SCORE_COLUMNS = ('email', 'domain', 'categories', 'age_bucket', 'open_rate_6m', 'engagement_score')
+SCORE_OPEN_RATE_POINTS = 70
+SCORE_RECENCY_POINTS = 30
+SCORE_RECENCY_DAYS = 365
+
+# Date columns are stored as whole seconds since EPOCH, with sentinels for missing values
+EPOCH = datetime(1970, 1, 1)
+NO_DATE = -2 ** 63            # Blank cell
+UNPARSED_DATE = -2 ** 63 + 1  # Non-blank cell that is not a recognised date
+SECONDS_PER_DAY = 86400
+
+# Rows per chunk when streaming the CSV
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Rows converted to typed columns at a time while loading
+EXTEND_BATCH_SIZE = 10_000
+
+# Parsed-export cache: directory created next to the CSV and its default size cap
+DEFAULT_CACHE_DIR = '.email_analysis_cache'
+DEFAULT_CACHE_SIZE = 2 << 30
+
+# Bytes scanned at a time when counting quotes to find row boundaries
+SCAN_BLOCK_SIZE = 1 << 24
+
+# Bytes decoded at a time by the memory-mapped tokenizer
+TOKENIZE_BLOCK_SIZE = 1 << 20
+
+
+def to_epoch_seconds(date: datetime) -> int:
+    """Convert a naive datetime to whole seconds since EPOCH"""
+    return (date - EPOCH) // timedelta(seconds=1)
+
+
+# Fixed-width ISO timestamp as exported by Substack (e.g., 2020-09-27T22:51:49.282Z)
+_ISO_TIMESTAMP = re.compile(r'(\d{4}-\d{2}-\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\..*|Z)?', re.ASCII | re.DOTALL).fullmatch
+
+
+class DateParser:
+    """Date parser for one export column
+
+    The column's format is detected from its first non-blank value. Fixed-width ISO
+    timestamps are then parsed by slicing, without strptime; anything else goes through
+    the original strptime fallbacks, memoized by raw string. Unparseable values give None,
+    exactly as before.
+    """
+
+    FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%m/%d/%Y', '%m/%d/%Y %H:%M:%S']
+
+    def __init__(self, cache_size: int = 65536):
+        self.iso = None        # True once the column is detected as ISO timestamps
+        self.formats = list(self.FORMATS)
+        self.cache_size = cache_size
+        self._cache = {}       # raw string -> datetime or None, for the strptime path
+        self._days = {}        # 'YYYY-MM-DD' -> days since EPOCH, or None if invalid
+
+    def _detect(self, date_str: str):
+        """Pick the column's format from its first non-blank value"""
+        self.iso = bool(_ISO_TIMESTAMP(date_str))
+        if not self.iso:
+            parsed, fmt = self._strptime(date_str)
+            if parsed is not None:
+                # At most one format can match a value, so trying the column's format first is safe
+                self.formats.remove(fmt)
+                self.formats.insert(0, fmt)
+
+    def _strptime(self, date_str: str) -> Tuple[datetime, str]:
+        """Original parsing path: normalise ISO timestamps, then try each format"""
         try:
             # Handle ISO format with timezone (e.g., 2020-09-27T22:51:49.282Z)
             if 'T' in date_str:
@@ -197,241 +309,1315 @@ class EmailAnalyzer:
                 date_str = date_str.split('.')[0].replace('T', ' ')
                 if date_str.endswith('Z'):
                     date_str = date_str[:-1]
-            
+
             # Try common date formats
-            for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%m/%d/%Y', '%m/%d/%Y %H:%M:%S']:
+            date_str = date_str.strip()
+            for fmt in self.formats:
                 try:
-                    return datetime.strptime(date_str.strip(), fmt)
+                    return datetime.strptime(date_str, fmt), fmt
                 except ValueError:
                     continue
-            return None
+            return None, None
         except:
+            return None, None
+
+    def _iso_epoch(self, match) -> int:
+        """Seconds since EPOCH from an ISO timestamp match, or None if it is not a valid date"""
+        day, hour, minute, second = match.groups()
+        days = self._days.get(day, False)
+        if days is False:
+            try:
+                days = (datetime(int(day[:4]), int(day[5:7]), int(day[8:])) - EPOCH).days
+            except ValueError:
+                days = None
+            self._days[day] = days
+        hour, minute, second = int(hour), int(minute), int(second)
+        if days is None or hour > 23 or minute > 59 or second > 59:
             return None
-    
-    def get_domain(self, email: str) -> str:
-        """Extract domain from email address"""
-        if '@' in email:
-            return '@' + email.split('@')[1].lower()
-        return ''
-    
-    def is_active(self, subscriber: dict) -> bool:
-        """Check if subscriber is active (has opened an email)"""
-        return bool(subscriber.get('Email last opened at', '').strip())
-    
-    def analyze_basic_stats(self) -> dict:
-        """Analyze basic statistics"""
-        total = len(self.subscribers)
-        never_opened = sum(1 for s in self.subscribers if not self.is_active(s))
-        
-        # Calculate overall average open rate for last 6 months
-        individual_open_rates = []
-        all_subscriber_open_rates = []
-        active_with_emails_open_rates = []
-        
-        for subscriber in self.subscribers:
-            emails_received = int(subscriber.get('Email receives (last 6 months)', 0) or 0)
-            emails_opened = int(subscriber.get('Emails opened (last 6 months)', 0) or 0)
-            is_active = self.is_active(subscriber)
-            
-            if emails_received > 0:
-                open_rate = (emails_opened / emails_received) * 100
-                individual_open_rates.append(open_rate)
-                all_subscriber_open_rates.append(open_rate)
-                
-                # Only include if subscriber has ever opened an email
-                if is_active:
-                    active_with_emails_open_rates.append(open_rate)
+        return days * SECONDS_PER_DAY + hour * 3600 + minute * 60 + second
+
+    def _cached(self, date_str: str):
+        parsed = self._cache.get(date_str, False)
+        if parsed is False:
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            parsed = self._cache[date_str] = self._strptime(date_str)[0]
+        return parsed
+
+    def parse(self, date_str: str) -> datetime:
+        """Parse date string to datetime object"""
+        if not date_str or date_str.isspace():
+            return None
+        if self.iso is None:
+            self._detect(date_str)
+        if self.iso:
+            match = _ISO_TIMESTAMP(date_str)
+            if match:
+                seconds = self._iso_epoch(match)
+                return None if seconds is None else EPOCH + timedelta(seconds=seconds)
+        return self._cached(date_str)
+
+    def parse_epoch(self, date_str: str) -> int:
+        """Parse date string to seconds since EPOCH, NO_DATE if blank and UNPARSED_DATE if unparseable"""
+        if not date_str or date_str.isspace():
+            return NO_DATE
+        if self.iso is None:
+            self._detect(date_str)
+        if self.iso:
+            match = _ISO_TIMESTAMP(date_str)
+            if match:
+                seconds = self._iso_epoch(match)
+                return UNPARSED_DATE if seconds is None else seconds
+        parsed = self._cached(date_str)
+        return UNPARSED_DATE if parsed is None else to_epoch_seconds(parsed)
+
+    def parse_column(self, values) -> array:
+        """Bulk-parse a column of date strings to seconds since EPOCH (see parse_epoch)"""
+        return array('q', map(self.parse_epoch, values))
+
+
+class _ByteRangeReader(io.RawIOBase):
+    """Raw binary reader limited to one byte range of a file"""
+
+    def __init__(self, path: str, start: int, stop: int):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = stop - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._file.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def open_csv(csv_file: str, byte_range: Tuple[int, int] = None):
+    """Open the export as text, optionally limited to a newline-aligned byte range"""
+    if byte_range is None:
+        return open(csv_file, 'r', encoding='utf-8')
+    return io.TextIOWrapper(io.BufferedReader(_ByteRangeReader(csv_file, *byte_range)), encoding='utf-8')
+
+
+def parse_sections(text: str) -> Tuple[str, ...]:
+    """Report sections named in a comma-separated list"""
+    sections = tuple(section.strip() for section in text.split(',') if section.strip())
+    unknown = [section for section in sections if section not in SECTION_COLUMNS]
+    if unknown or not sections:
+        raise argparse.ArgumentTypeError(f"unknown report section {', '.join(unknown) or text!r} "
+                                         f"(choose from {', '.join(SECTION_COLUMNS)})")
+    return sections
+
+
+def section_columns(sections) -> Tuple[str, ...]:
+    """CSV columns needed by the given report sections, in ANALYSIS_COLUMNS order"""
+    needed = set()
+    for section in sections:
+        needed.update(SECTION_COLUMNS[section])
+    return tuple(column for column in ANALYSIS_COLUMNS if column in needed)
+
+
+def read_projected(f, columns: Tuple[str, ...] = ANALYSIS_COLUMNS, fieldnames: List[str] = None):
+    """Read CSV rows as tuples of their ANALYSIS_COLUMNS fields, without building per-row dicts
+
+    Field positions are resolved from the header (or the given fieldnames, for files and
+    byte ranges without one) once. Columns missing from the export, or not listed in
+    columns, read as blank, and blank lines are skipped as csv.DictReader does.
+    """
+    reader = csv.reader(f)
+    if fieldnames is None:
+        fieldnames = next(reader, [])
+    project, width, known = _projection(fieldnames, columns)
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width or (width > known and len(row) > known):
+            row = _fit(row, width, known)
+        yield project(row)
+
+
+def _projection(fieldnames: List[str], columns: Tuple[str, ...]):
+    """itemgetter picking the ANALYSIS_COLUMNS fields of a row, the row width it needs, and the header width"""
+    known = len(fieldnames)
+    header = {name: position for position, name in enumerate(fieldnames)}  # Last duplicate wins, as in DictReader
+    # Missing columns point one past the header, where every row gets a blank field
+    positions = [header.get(column, known) if column in columns else known for column in ANALYSIS_COLUMNS]
+    width = max(positions) + 1
+    return itemgetter(*positions), width, known
+
+
+def _fit(row: List[str], width: int, known: int) -> List[str]:
+    """Pad a short row with blanks, and blank any field past the header a missing column points at"""
+    return row[:known] + [''] * (width - min(len(row), known))
+
+
+def read_projected_mmap(csv_file: str, columns: Tuple[str, ...] = ANALYSIS_COLUMNS, fieldnames: List[str] = None,
+                        byte_range: Tuple[int, int] = None):
+    """Like read_projected, but tokenizes the memory-mapped export itself, a block at a time
+
+    Each block is decoded in one call and newlines are normalized as text mode would; lines
+    without quotes are then split on commas directly. At a line with a quote, csv.reader
+    takes over for that one record, pulling further lines only for embedded newlines.
+    """
+    with open(csv_file, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        start, stop = byte_range or (0, size)
+        if stop <= start:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            unterminated = False  # Set while the last line, which has no newline, is being read
+            release = hasattr(mmap, 'MADV_DONTNEED')
+
+            def read_blocks():
+                nonlocal unterminated
+                pos = start
+                released = start - start % mmap.PAGESIZE
+                while pos < stop:
+                    # Blocks end after a newline, so neither UTF-8 sequences nor CRLF pairs are split
+                    end = min(pos + TOKENIZE_BLOCK_SIZE, stop)
+                    if end < stop:
+                        newline = data.rfind(b'\n', pos, end)
+                        if newline < 0:
+                            newline = data.find(b'\n', end, stop)
+                        end = stop if newline < 0 else newline + 1
+                    text = data[pos:end].decode('utf-8')
+                    pos = end
+                    if release:
+                        # Hand the decoded pages back so they do not add up in the resident set
+                        upto = pos - pos % mmap.PAGESIZE
+                        if upto > released:
+                            data.madvise(mmap.MADV_DONTNEED, released, upto - released)
+                            released = upto
+                    if '\r' in text:
+                        text = text.replace('\r\n', '\n').replace('\r', '\n')
+                    lines = text.split('\n')
+                    last = lines.pop()
+                    yield lines
+                    if last:
+                        unterminated = True
+                        yield [last]
+
+            def with_newlines():
+                for line in lines:
+                    yield line if unterminated else line + '\n'
+
+            lines = chain.from_iterable(read_blocks())
+            project = width = known = None
+            if fieldnames is not None:
+                project, width, known = _projection(fieldnames, columns)
+            for line in lines:
+                if '"' in line:
+                    # csv.reader resumes from this line, reading on through any quoted newlines
+                    row = next(csv.reader(chain((line if unterminated else line + '\n',), with_newlines())))
+                elif line:
+                    row = line.split(',')
+                else:
+                    continue
+                if project is None:
+                    project, width, known = _projection(row, columns)
+                    continue
+                if len(row) < width or (width > known and len(row) > known):
+                    row = _fit(row, width, known)
+                yield project(row)
+
+
+def read_export(csv_file: str, use_mmap: bool = True, columns: Tuple[str, ...] = ANALYSIS_COLUMNS,
+                fieldnames: List[str] = None, byte_range: Tuple[int, int] = None):
+    """Projected rows of the export, or of one byte range of it, through read_projected_mmap or the csv module"""
+    if use_mmap:
+        yield from read_projected_mmap(csv_file, columns, fieldnames, byte_range)
+    else:
+        with open_csv(csv_file, byte_range) as f:
+            yield from read_projected(f, columns, fieldnames)
+
+
+def _count_quotes(data, start: int, stop: int) -> int:
+    """Count quote characters in data[start:stop], a block at a time"""
+    count = 0
+    for block in range(start, stop, SCAN_BLOCK_SIZE):
+        count += data[block:min(block + SCAN_BLOCK_SIZE, stop)].count(b'"')
+    return count
+
+
+def _next_row_start(data, pos: int, parity: int) -> Tuple[int, int]:
+    """Find the first row start after pos, given the quote count parity at pos"""
+    size = len(data)
+    while pos < size:
+        newline = data.find(b'\n', pos)
+        if newline < 0:
+            break
+        parity = (parity + _count_quotes(data, pos, newline + 1)) & 1
+        pos = newline + 1
+        # A newline outside quotes ends a row; inside quotes it is part of a field
+        if not parity:
+            return pos, parity
+    return size, parity
+
+
+def split_csv(csv_file: str, parts: int) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """Split the export into its header field names and up to `parts` byte ranges of whole rows
+
+    Quoted fields may contain newlines, so a range only ends at a newline preceded by an
+    even number of quote characters (Substack quotes any field containing a quote).
+    """
+    with open(csv_file, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return [], []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header_end, _ = _next_row_start(data, 0, 0)
+            with io.TextIOWrapper(io.BytesIO(data[:header_end]), encoding='utf-8') as header:
+                fieldnames = next(csv.reader(header), [])
+
+            bounds = [header_end]
+            pos, parity = header_end, 0
+            for part in range(1, parts):
+                target = header_end + (size - header_end) * part // parts
+                if target <= pos:
+                    continue
+                parity = (parity + _count_quotes(data, pos, target)) & 1
+                pos, parity = _next_row_start(data, target, parity)
+                if pos >= size:
+                    break
+                bounds.append(pos)
+            bounds.append(size)
+    return fieldnames, [(start, stop) for start, stop in zip(bounds, bounds[1:]) if start < stop]
+
+
+# Domain category bits
+EDU = 1 << 0
+PROMINENT_EDU = 1 << 1
+FORTUNE_100 = 1 << 2
+VC_STARTUP = 1 << 3
+GOV = 1 << 4
+PROMINENT_GOV = 1 << 5
+STATE_GOV = 1 << 6
+MEDIA = 1 << 7
+ORG = 1 << 8
+MAJOR_PHILANTHROPY = 1 << 9
+ALL_PHILANTHROPY = 1 << 10
+BUILTIN_CATEGORIES = (1 << 11) - 1  # Bits above these belong to CategoryRegistry categories
+
+# Categories broken down by name in the distribution and overlap sections
+CATEGORIES = {
+    '.edu': EDU,
+    'Fortune 100': FORTUNE_100,
+    'VC/startup': VC_STARTUP,
+    '.gov': GOV,
+    'Media': MEDIA,
+    'Philanthropy': ALL_PHILANTHROPY,
+}
+
+class DomainMatcher:
+    """Aho-Corasick automaton that matches many domain rules in one scan of a domain
+
+    Substring rules match anywhere in the domain (how PROMINENT_GOV_EMAILS has always been
+    applied). Suffix rules match the domain itself or any subdomain of it, so 'nasa.gov'
+    matches '@nasa.gov' and '@jpl.nasa.gov' but not '@fakenasa.gov'. Matching is linear in
+    the domain length however many rules there are.
+    """
+
+    def __init__(self, substrings=(), suffixes=()):
+        self.rules = list(substrings) + list(suffixes)
+        self.suffix_from = len(self.rules) - len(suffixes)  # Rules at or after this index are suffix rules
+        self.goto = [{}]   # node -> {character: node}
+        self.fail = [0]    # node -> longest proper suffix node
+        self.output = [()]  # node -> indices of rules ending here
+
+        for index, rule in enumerate(self.rules):
+            node = 0
+            for char in rule:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = self.goto[node][char] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                node = next_node
+            self.output[node] += (index,)
+
+        # Breadth-first failure links, inheriting the outputs of each node's failure target
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] += self.output[self.fail[child]]
+
+    def matches(self, domain: str) -> Tuple[str, ...]:
+        """Rules matching the domain, each once, in the order they were given"""
+        return tuple(self.rules[index] for index in self.indices(domain))
+
+    def indices(self, domain: str) -> List[int]:
+        """Positions in self.rules of the rules matching the domain, in order"""
+        goto, fail, output = self.goto, self.fail, self.output
+        last = len(domain) - 1
+        found = set()
+        node = 0
+        for pos, char in enumerate(domain):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in output[node]:
+                if index >= self.suffix_from:
+                    # Suffix rules must end the domain and start at a label boundary
+                    start = pos - len(self.rules[index])
+                    if pos != last or (start >= 0 and domain[start] not in '.@'):
+                        continue
+                found.add(index)
+        return sorted(found)
+
+
+class CategoryRegistry:
+    """Custom domain categories loaded from data files and compiled into one lookup
+
+    A category lists exact domains ('@example.com'), suffix domains that also match every
+    subdomain ('example.com' matches '@example.com' and '@mail.example.com'), and
+    substrings matched anywhere. Exact domains of every category share one dict, and the
+    other rules of every category share one DomainMatcher automaton, so classifying a domain
+    is one dict probe plus one scan of the domain however many categories there are. Each
+    category gets a bit above BUILTIN_CATEGORIES in the domain masks.
+    """
+
+    MATCHES = ('exact', 'suffix', 'contains')
+
+    def __init__(self):
+        self.names = []       # Category names, in bit order
+        self.bits = {}        # name -> bit
+        self.exact = {}       # '@domain' -> bits of the categories listing it
+        self.rules = {'suffix': {}, 'contains': {}}  # rule -> bits
+        self.labels = {}      # (name, domain rule) -> label, e.g. the company behind a domain
+        self._matcher = None
+        self._rule_bits = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def category(self, name: str) -> int:
+        """The bit of a category, adding it on first use"""
+        bit = self.bits.get(name)
+        if bit is None:
+            bit = self.bits[name] = (BUILTIN_CATEGORIES + 1) << len(self.names)
+            self.names.append(name)
+        return bit
+
+    def add(self, name: str, rule: str, match: str = None, label: str = None):
+        """Add a domain rule to a category; match defaults to exact for '@domain' and suffix otherwise"""
+        rule = rule.strip().lower()
+        match = match or ('exact' if rule.startswith('@') else 'suffix')
+        if match not in self.MATCHES:
+            raise ValueError(f"unknown match {match!r} for {rule!r} (expected one of {', '.join(self.MATCHES)})")
+        bit = self.category(name)
+        rules = self.exact if match == 'exact' else self.rules[match]
+        rules[rule] = rules.get(rule, 0) | bit
+        if label:
+            self.labels[name, rule] = label
+        self._matcher = None
+
+    def load(self, path: str) -> 'CategoryRegistry':
+        """Add the categories in a .csv, .json or .yaml file
+
+        CSV files have category and domain columns, plus optional match and label columns.
+        JSON and YAML files map each category to a list of domains, or to a mapping with
+        'domains', 'contains' and 'labels' ({domain: label}) entries.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if extension == '.csv':
+                for row in csv.DictReader(f):
+                    self.add(row['category'], row['domain'], row.get('match') or None, row.get('label') or None)
+                return self
+            if extension in ('.yaml', '.yml'):
+                if yaml is None:
+                    raise ValueError(f"{path}: reading YAML category files needs PyYAML; use CSV or JSON instead")
+                data = yaml.safe_load(f) or {}
             else:
-                # For subscribers with 0 emails received, count as 0% open rate
-                all_subscriber_open_rates.append(0.0)
-        
-        avg_open_rate = sum(individual_open_rates) / len(individual_open_rates) if individual_open_rates else 0
-        avg_open_rate_all = sum(all_subscriber_open_rates) / len(all_subscriber_open_rates) if all_subscriber_open_rates else 0
-        avg_open_rate_active_with_emails = sum(active_with_emails_open_rates) / len(active_with_emails_open_rates) if active_with_emails_open_rates else 0
-        
+                data = json.load(f)
+        for name, entry in data.items():
+            if not isinstance(entry, dict):
+                entry = {'domains': entry}
+            domains = list(entry.get('domains') or ())
+            labels = entry.get('labels') or {}
+            for rule in domains + [rule for rule in labels if rule not in domains]:
+                self.add(name, rule, label=labels.get(rule))
+            for rule in entry.get('contains') or ():
+                self.add(name, rule, 'contains')
+        return self
+
+    def compile(self):
+        """Build the automaton over every category's suffix and substring rules"""
+        contains, suffixes = list(self.rules['contains']), list(self.rules['suffix'])
+        self._matcher = DomainMatcher(contains, suffixes)
+        self._rule_bits = [self.rules['contains'][rule] for rule in contains] + [self.rules['suffix'][rule] for rule in suffixes]
+
+    def classify(self, domain: str) -> int:
+        """Bits of every category the domain belongs to"""
+        if self._matcher is None:
+            self.compile()
+        mask = self.exact.get(domain, 0)
+        for index in self._matcher.indices(domain):
+            mask |= self._rule_bits[index]
+        return mask
+
+    def label(self, name: str, domain: str) -> str:
+        """Label of a domain within a category: that of the rule it matched, else the domain itself"""
+        if (name, domain) in self.labels:
+            return self.labels[name, domain]
+        if self._matcher is None:
+            self.compile()
+        for index in self._matcher.indices(domain):
+            rule = self._matcher.rules[index]
+            if (name, rule) in self.labels:
+                return self.labels[name, rule]
+        return domain
+
+    def digest(self) -> str:
+        """Fingerprint of the categories and rules, to tell whether saved results used the same ones"""
+        content = json.dumps([self.names, sorted(self.exact.items()), sorted(self.rules['suffix'].items()),
+                              sorted(self.rules['contains'].items())])
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+    def __getstate__(self) -> dict:
+        # The automaton is rebuilt on first use after unpickling
+        state = dict(self.__dict__)
+        state['_matcher'] = None
+        state['_rule_bits'] = []
+        return state
+
+
+class DomainIndex:
+    """Category classification of each distinct email domain, computed once per domain
+
+    Rows carry only a domain code. The category bitmask, the Fortune 100 company name and
+    the prominent .gov rules a domain matches are looked up by code. Categories of the
+    registry, if any, are added to the built-in ones.
+    """
+
+    def __init__(self, registry: CategoryRegistry = None):
+        self.registry = CategoryRegistry() if registry is None else registry
+        self.domains = []      # Interned lowercase '@domain' strings, in first-seen order
+        self.codes = {}        # domain -> code
+        self.masks = []        # code -> category bits
+        self.companies = {}    # code -> company name, Fortune 100 domains only
+        self.gov_matches = {}  # code -> prominent .gov rules contained in the domain
+        self.gov_matcher = DomainMatcher(PROMINENT_GOV_EMAILS)
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+    def intern(self, domain: str) -> int:
+        """Return the code for a domain, classifying it and assigning the next code on first sight"""
+        code = self.codes.get(domain)
+        if code is None:
+            code = self.codes[domain] = len(self.domains)
+            self.domains.append(domain)
+            mask, company, gov_matches = self.classify(domain)
+            self.masks.append(mask)
+            if company is not None:
+                self.companies[code] = company
+            if gov_matches:
+                self.gov_matches[code] = gov_matches
+        return code
+
+    def classify(self, domain: str) -> Tuple[int, str, Tuple[str, ...]]:
+        """Category bits, Fortune 100 company name and matching prominent .gov rules for one domain"""
+        mask = 0
+        company = None
+        gov_matches = ()
+        if domain.endswith('.edu'):
+            mask |= EDU
+            if domain in PROMINENT_EDU_EMAILS:
+                mask |= PROMINENT_EDU
+        if domain in FORTUNE_100_EMAILS:
+            mask |= FORTUNE_100
+            company = COMPANY_NAME_MAPPING.get(domain, domain)
+        if domain in VC_STARTUP_EMAILS:
+            mask |= VC_STARTUP
+        if '.gov' in domain:
+            mask |= GOV
+            # A domain counts once for every prominent rule it contains
+            gov_matches = self.gov_matcher.matches(domain)
+            if gov_matches:
+                mask |= PROMINENT_GOV
+            if domain in STATE_GOV_EMAILS:
+                mask |= STATE_GOV
+        if domain in MEDIA_EMAILS:
+            mask |= MEDIA
+        if domain.endswith('.org'):
+            mask |= ORG
+        if domain in MAJOR_PHILANTHROPY_EMAILS:
+            mask |= MAJOR_PHILANTHROPY
+        if domain in ALL_PHILANTHROPY_EMAILS:
+            mask |= ALL_PHILANTHROPY
+        if self.registry:
+            mask |= self.registry.classify(domain)
+        return mask, company, gov_matches
+
+    def mask(self, domain: str) -> int:
+        """Category bits for a domain"""
+        return self.masks[self.intern(domain)]
+
+    @classmethod
+    def of(cls, domains: List[str], registry: CategoryRegistry = None) -> 'DomainIndex':
+        """An index holding the given domains at codes in list order"""
+        index = cls(registry)
+        for domain in domains:
+            index.intern(domain)
+        return index
+
+
+# Last opened value stored for a blank (False) or non-blank (True) cell that is not parsed as a date
+_OPENED_DATES = (NO_DATE, UNPARSED_DATE)
+
+
+def _to_count(value: str) -> int:
+    """Parse an email count cell, treating blanks as 0"""
+    return int(value or 0)
+
+
+class Subscriber:
+    """One subscriber's parsed fields, as read from a SubscriberStore row"""
+
+    __slots__ = ('received', 'opened', 'subscribed', 'last_opened', 'domain_id')
+
+    def __init__(self, received: int, opened: int, subscribed: int, last_opened: int, domain_id: int):
+        self.received = received
+        self.opened = opened
+        self.subscribed = subscribed    # Seconds since EPOCH, or NO_DATE / UNPARSED_DATE
+        self.last_opened = last_opened  # Seconds since EPOCH, or NO_DATE / UNPARSED_DATE
+        self.domain_id = domain_id      # Code in the store's DomainIndex
+
+    @property
+    def active(self) -> bool:
+        """Whether the subscriber has opened an email"""
+        return self.last_opened != NO_DATE
+
+    def __repr__(self) -> str:
+        return (f"Subscriber(received={self.received}, opened={self.opened}, subscribed={self.subscribed}, "
+                f"last_opened={self.last_opened}, domain_id={self.domain_id})")
+
+
+class SubscriberStore:
+    """Columnar subscriber storage holding only the typed columns the analysis uses
+
+    Iterating or indexing the store gives Subscriber records; the analysis itself works on
+    the columns, which take 28 bytes per subscriber.
+    """
+
+    COLUMNS = ('received', 'opened', 'subscribed', 'last_opened', 'domain_ids')
+
+    def __init__(self, index: DomainIndex = None):
+        self.received = array('i')     # Email receives (last 6 months)
+        self.opened = array('i')       # Emails opened (last 6 months)
+        self.subscribed = array('q')   # Subscription date, seconds since EPOCH
+        self.last_opened = array('q')  # Email last opened at, seconds since EPOCH
+        self.domain_ids = array('i')   # Code in self.index
+        # Shared across chunks so each distinct domain is classified only once
+        self.index = DomainIndex() if index is None else index
+
+    def __len__(self) -> int:
+        return len(self.received)
+
+    def __getitem__(self, row: int) -> Subscriber:
+        return Subscriber(*(getattr(self, name)[row] for name in self.COLUMNS))
+
+    def __iter__(self):
+        return map(Subscriber, *(getattr(self, name) for name in self.COLUMNS))
+
+    @property
+    def domains(self) -> List[str]:
+        """Domain strings by code"""
+        return self.index.domains
+
+    def domain(self, subscriber: Subscriber) -> str:
+        """Domain string of a subscriber record"""
+        return self.index.domains[subscriber.domain_id]
+
+    def extend(self, rows, get_domain, date_parsers: Dict[str, DateParser], profiler: 'StageProfiler' = None,
+               columns: Tuple[str, ...] = ANALYSIS_COLUMNS):
+        """Convert projected CSV rows (see read_projected) to typed columns and append them, a batch at a time
+
+        Only the given columns are parsed; the others are filled with blanks (0 counts, no dates
+        and an empty domain) so that sections which do not read them skip their parsing. The
+        report sections only ask whether the last opened date is blank, so unless every column
+        is wanted (for the cache, snapshots and scores) it is not parsed: non-blank cells are
+        stored as UNPARSED_DATE, which still counts as opened.
+        """
+        stage = profiler.stage if profiler else _no_stage
+        rows = iter(rows)
+        while True:
+            with stage('read_csv') as timing:
+                batch = list(islice(rows, EXTEND_BATCH_SIZE))
+                timing['rows'] = len(batch)
+            if not batch:
+                return
+            emails, subscribed, last_opened, receives, opens = zip(*batch)
+            rows_in_batch = len(batch)
+            with stage('parse_counts', rows_in_batch):
+                for column, values, parsed in ((RECEIVES_COLUMN, receives, self.received),
+                                               (OPENS_COLUMN, opens, self.opened)):
+                    parsed.extend(map(_to_count, values) if column in columns else repeat(0, rows_in_batch))
+            with stage('parse_dates', rows_in_batch):
+                for column, values, parsed in ((SUBSCRIPTION_DATE_COLUMN, subscribed, self.subscribed),
+                                               (LAST_OPENED_COLUMN, last_opened, self.last_opened)):
+                    if column == LAST_OPENED_COLUMN and column in columns and columns != ANALYSIS_COLUMNS:
+                        parsed.extend(map(_OPENED_DATES.__getitem__, map(bool, map(str.strip, values))))
+                    elif column in columns:
+                        parsed.extend(date_parsers[column].parse_column(values))
+                    else:
+                        parsed.extend(repeat(NO_DATE, rows_in_batch))
+            with stage('classify_domains', rows_in_batch):
+                if EMAIL_COLUMN in columns:
+                    self.domain_ids.extend(map(self.index.intern, map(get_domain, map(str.lower, emails))))
+                else:
+                    self.domain_ids.extend(repeat(self.index.intern(''), rows_in_batch))
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, object], domains: List[str],
+                     registry: CategoryRegistry = None) -> 'SubscriberStore':
+        """Build a store over existing column buffers, interning the domains in code order"""
+        store = cls(DomainIndex.of(domains, registry))
+        for name, values in columns.items():
+            setattr(store, name, values)
+        return store
+
+    def __getstate__(self) -> dict:
+        # Persist domain strings only; categories are re-classified when loaded
+        state = dict(self.__dict__)
+        state['index'] = list(self.index.domains)
+        return state
+
+    def __setstate__(self, state: dict):
+        domains = state.pop('index')
+        self.__dict__.update(state)
+        self.index = DomainIndex.of(domains)
+
+    def take(self, rows) -> 'SubscriberStore':
+        """Copy the given rows into a new store sharing this store's domain index"""
+        taken = SubscriberStore(self.index)
+        for name in self.COLUMNS:
+            getattr(taken, name).extend(map(getattr(self, name).__getitem__, rows))
+        return taken
+
+    def put(self, row: int, other: 'SubscriberStore', index: int):
+        """Overwrite one row (or append it, if row is the length) from another store sharing the index"""
+        for name in self.COLUMNS:
+            values = getattr(self, name)
+            value = getattr(other, name)[index]
+            if row == len(values):
+                values.append(value)
+            else:
+                values[row] = value
+
+    def active_flags(self) -> bytes:
+        """1 for each subscriber who has opened an email, else 0"""
+        return bytes(map(ne, self.last_opened, repeat(NO_DATE)))
+
+
+def _align8(offset: int) -> int:
+    return -(-offset // 8) * 8
+
+
+class ExportCache:
+    """On-disk cache of parsed exports, one memory-mapped columnar file per export
+
+    Entries are keyed by the CSV's content hash. A small index remembers each path's size,
+    mtime and hash, so an unchanged file is recognised without rehashing it and any edit
+    invalidates its entry automatically. Once the directory holds more than max_bytes of
+    entries, the least recently used ones are evicted. Only parsed columns and domain
+    strings are cached; categories are re-classified on load, so editing the category sets
+    never needs a cache flush.
+    """
+
+    VERSION = 1
+    MAGIC = b'ESACACHE'
+    INDEX_FILE = 'index.json'
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def beside(cls, csv_file: str, max_bytes: int = DEFAULT_CACHE_SIZE) -> 'ExportCache':
+        """Cache in a hidden directory next to the CSV"""
+        return cls(os.path.join(os.path.dirname(os.path.abspath(csv_file)), DEFAULT_CACHE_DIR), max_bytes)
+
+    def _read_index(self) -> dict:
+        try:
+            with open(os.path.join(self.directory, self.INDEX_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_atomic(self, path: str, write):
+        """Write a file through a temporary name so readers never see it half-written"""
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            write(f)
+        os.replace(temp_path, path)
+
+    def file_hash(self, csv_file: str) -> str:
+        """Content hash of the CSV, reusing the recorded hash while its size and mtime are unchanged"""
+        stat = os.stat(csv_file)
+        key = os.path.abspath(csv_file)
+        index = self._read_index()
+        entry = index.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['hash']
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(csv_file, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        index[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest.hexdigest()}
+        self._write_atomic(os.path.join(self.directory, self.INDEX_FILE),
+                           lambda f: f.write(json.dumps(index).encode('utf-8')))
+        return index[key]['hash']
+
+    def entry_path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest + '.cols')
+
+    def load(self, digest: str, registry: CategoryRegistry = None) -> SubscriberStore:
+        """Map a cached export's columns without copying them, or return None on a miss
+
+        Domains are classified afresh, with the registry's categories if given.
+        """
+        path = self.entry_path(digest)
+        try:
+            with open(path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        header_size = int.from_bytes(data[8:16], 'little')
+        try:
+            header = json.loads(data[16:16 + header_size])
+        except ValueError:
+            header = None
+        if (data[:8] != self.MAGIC or not header or header.get('version') != self.VERSION
+                or header.get('hash') != digest or header.get('byteorder') != sys.byteorder):
+            data.close()
+            os.remove(path)
+            return None
+
+        # Column offsets are relative to the 8-byte aligned end of the header
+        data_start = _align8(16 + header_size)
+        view = memoryview(data)
+        columns = {name: view[data_start + offset:data_start + offset + size].cast(typecode)
+                   for name, (offset, size, typecode) in header['columns'].items()}
+        store = SubscriberStore.from_columns(columns, header['domains'], registry)
+        store.buffer = data  # Keep the mapping open for as long as the store lives
+        # Mark the entry as recently used
+        os.utime(path)
+        return store
+
+    def save(self, digest: str, store: SubscriberStore):
+        """Write a parsed export as a columnar cache entry, then evict entries over the size cap"""
+        columns = {}
+        offset = 0
+        for name in SubscriberStore.COLUMNS:
+            values = getattr(store, name)
+            columns[name] = (offset, len(values) * values.itemsize, values.typecode)
+            offset = _align8(offset + len(values) * values.itemsize)
+        header = json.dumps({
+            'version': self.VERSION,
+            'hash': digest,
+            'byteorder': sys.byteorder,
+            'rows': len(store),
+            'columns': columns,
+            'domains': store.domains
+        }).encode('utf-8')
+
+        def write(f):
+            f.write(self.MAGIC)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            data_start = _align8(f.tell())
+            for name in SubscriberStore.COLUMNS:
+                f.write(b'\0' * (data_start + columns[name][0] - f.tell()))
+                f.write(getattr(store, name))
+
+        self._write_atomic(self.entry_path(digest), write)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.cols'):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+def open_rate(received: int, opened: int) -> float:
+    """Open rate in percent for one subscriber who received at least one email"""
+    return (opened / received) * 100
+
+
+class Buckets:
+    """Histogram bucket edges with a label per bucket
+
+    Bucket i holds the values from edges[i] up to edges[i + 1]; the last bucket is open-ended
+    and values below edges[0] get a negative index. Evenly spaced buckets are assigned by
+    division, any others by binary search over the edges (as numpy's searchsorted).
+    """
+
+    def __init__(self, edges, labels: List[str] = None, width=None):
+        self.edges = list(edges)
+        if not self.edges or any(map(ge, self.edges, self.edges[1:])):
+            raise ValueError(f"bucket edges must be increasing: {edges!r}")
+        if labels is None:
+            labels = [f"{low:g}-{high:g}" for low, high in zip(self.edges, self.edges[1:])] + [f"{self.edges[-1]:g}+"]
+        self.labels = list(labels)
+        self.width = width  # Set when the edges are 0, width, 2 * width, ...
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    @classmethod
+    def linear(cls, width, count: int, labels: List[str] = None) -> 'Buckets':
+        """count buckets of equal width starting at 0"""
+        return cls([width * i for i in range(count)], labels, width)
+
+    @classmethod
+    def log(cls, start, factor, count: int, labels: List[str] = None) -> 'Buckets':
+        """A bucket below start, then count - 1 buckets each factor times as wide as the last"""
+        return cls([0] + [start * factor ** i for i in range(count - 1)], labels)
+
+    def assign(self, values):
+        """Bucket index of each value"""
+        if self.width:
+            return map(min, map(int, map(floordiv, values, repeat(self.width))), repeat(len(self.edges) - 1))
+        return map(sub, map(bisect_right, repeat(self.edges), values), repeat(1))
+
+    def bucket(self, value) -> int:
+        """Bucket index of one value"""
+        return next(self.assign((value,)))
+
+
+def age_view_widths(text: str) -> Tuple[int, ...]:
+    """Age histogram bucket widths in months from a comma-separated list (an argparse type)"""
+    try:
+        widths = tuple(int(width) for width in text.split(','))
+    except ValueError:
+        widths = ()
+    if not widths or min(widths) < 1:
+        raise argparse.ArgumentTypeError(f"age histogram widths must be positive whole months, not {text!r}")
+    return widths
+
+
+def months_before(day: date, months: int) -> date:
+    """The same day of the month, months earlier (clamped to the end of shorter months)"""
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    return day.replace(year=year, month=month + 1, day=min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def age_buckets(months: int, years_back: int, now: datetime = None) -> Buckets:
+    """Subscription age buckets (in days of age) of months each, the last one open-ended after years_back years
+
+    A month is 30 days, unless now is given: then edges fall on the same day of the month as
+    now, so buckets follow calendar months.
+    """
+    count = -(-years_back * 12 // months)
+    labels = [f"{i * months:3d}-{(i + 1) * months:<3d} months" for i in range(count)]
+    if now is None:
+        return Buckets.linear(30 * months, count, labels)
+    today = now.date()
+    return Buckets([(today - months_before(today, i * months)).days for i in range(count)], labels)
+
+
+def open_rate_buckets(text: str) -> Buckets:
+    """Open rate buckets from comma-separated percent edges, or 'log' for doubling widths from 1%
+
+    Edges must increase and lie in 0-100 (100 excluded); a 0 edge is added if missing, so every
+    rate falls in a bucket. Raises argparse.ArgumentTypeError otherwise (this is an argparse type).
+    """
+    try:
+        edges = [0, 1, 2, 4, 8, 16, 32, 64] if text.strip() == 'log' else [float(edge) for edge in text.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"open rate edges must be numbers or 'log', not {text!r}") from None
+    if edges[0] > 0:
+        edges.insert(0, 0)
+    if edges[0] < 0 or edges[-1] >= 100 or any(map(ge, edges, edges[1:])):
+        raise argparse.ArgumentTypeError(f"open rate edges must increase from 0 and stay below 100, not {text!r}")
+    bounds = [f"{edge:g}" for edge in edges + [100]]
+    width = max(map(len, bounds))
+    return Buckets(edges, [f"{low:>{width}}-{high:<{width}}% open rate" for low, high in zip(bounds, bounds[1:])])
+
+
+# Default open rate histogram buckets: 10% steps
+OPEN_RATE_BUCKETS = Buckets.linear(10, 10, [f"{i * 10:2d}-{(i + 1) * 10:<3d}% open rate" for i in range(10)])
+
+
+def sum_open_rates(tally) -> Tuple[float, int]:
+    """Sum and count the open rates in a {(received, opened): subscribers} tally, skipping zero receives
+
+    The sum is exact (correctly rounded), so it does not depend on how the rows were split
+    across workers or which were removed since.
+    """
+    total = Fraction(0)
+    count = 0
+    for (received, opened), subscribers in tally.items():
+        if received > 0:
+            total += Fraction(open_rate(received, opened)) * subscribers
+            count += subscribers
+    return float(total), count
+
+
+def open_rate_summary(tally) -> dict:
+    """Count, mean, standard deviation and percentiles of the open rates in a {(received, opened): subscribers} tally
+
+    Subscribers with zero receives are skipped. The tally holds every distinct rate with its
+    multiplicity, so these are exact, not sketched: the moments are exact sums and each
+    percentile is the nearest-rank rate (the smallest with at least p% of subscribers at or below it).
+    """
+    rates = Counter()
+    for (received, opened), subscribers in tally.items():
+        if received > 0 and subscribers > 0:
+            rates[Fraction(opened, received)] += subscribers
+    count = sum(rates.values())
+    summary = {'count': count, 'mean': 0, 'std': 0}
+    summary.update((f"p{percentile}", 0) for percentile in OPEN_RATE_PERCENTILES)
+    if not count:
+        return summary
+
+    mean = sum(rate * subscribers for rate, subscribers in rates.items()) / count
+    variance = sum((rate - mean) ** 2 * subscribers for rate, subscribers in rates.items()) / count
+    summary['mean'] = float(mean * 100)
+    summary['std'] = math.sqrt(variance) * 100
+
+    ranks = iter(sorted((-(-percentile * count // 100) or 1, f"p{percentile}") for percentile in OPEN_RATE_PERCENTILES))
+    rank, key = next(ranks)
+    seen = 0
+    for rate in sorted(rates):
+        seen += rates[rate]
+        while rank is not None and seen >= rank:
+            summary[key] = float(rate * 100)
+            rank, key = next(ranks, (None, None))
+    return summary
+
+
+class ReportAccumulator:
+    """Mergeable accumulator that feeds every report section from one columnar pass over the subscribers
+
+    Subscribers are tallied by their (emails received, emails opened) pair, overall, for
+    active subscribers, per age bucket and per domain category mask. Every numeric section
+    derives from those tallies, so partial accumulators from chunks or workers merge exactly,
+    and their size is bounded by the distinct pairs, not the subscribers.
+
+    Mean open rates come from float sums added in row order, as a single sequential pass
+    sums them, while every update has folded rows in file order. Merging partials or removing
+    rows loses that order, and the means then use exact sums over the tallies instead.
+    """
+
+    TALLIES = ('pairs', 'active_pairs', 'age_pairs', 'domain_total', 'domain_active', 'category_pairs',
+               'subscription_days')
+
+    def __init__(self, analyzer: 'EmailAnalyzer'):
+        # Category lookups for the domain sections; not pickled with partial results
+        self.index = analyzer.domain_index
+        self.now = to_epoch_seconds(analyzer.current_date)
+        self.years_back = analyzer.years_back
+        self.age_buckets = analyzer.age_buckets
+        # Histogram views derived from the tallies when read; they do not change what is tallied
+        self.open_rate_buckets = analyzer.open_rate_buckets
+        self.age_views = analyzer.age_views
+        self.calendar_months = analyzer.calendar_months
+        self.pairs = Counter()         # (received, opened) -> subscribers
+        self.active_pairs = Counter()  # (received, opened) -> subscribers who have opened an email
+        self.age_pairs = Counter()     # (age bucket, received, opened) -> subscribers, in first-seen order
+        # Per domain subscriber counts, in first-seen order
+        self.domain_total = Counter()
+        self.domain_active = Counter()
+        self.category_pairs = Counter()  # (category bits, received, opened) -> subscribers
+        self.subscription_days = Counter()  # Subscription day (since EPOCH) -> subscribers, for age_views
+        # Open rate sums in row order, overall, over active subscribers and per age bucket;
+        # only used while in_row_order, as merges and removals reorder the additions
+        self.in_row_order = True
+        self.rate_sum = 0.0
+        self.active_rate_sum = 0.0
+        self.age_rate_sums = {}
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        state['index'] = None
+        return state
+
+    def _ages(self, store: SubscriberStore) -> tuple:
+        """Which rows have a subscription date, which of those are not in the future, and their age buckets"""
+        dated = bytes(map(gt, store.subscribed, repeat(UNPARSED_DATE)))
+        ages = array('q', map(floordiv, map(sub, repeat(self.now), compress(store.subscribed, dated)), repeat(SECONDS_PER_DAY)))
+        past = bytes(map(ge, ages, repeat(0)))
+        return dated, past, array('q', self.age_buckets.assign(compress(ages, past)))
+
+    def _keys(self, store: SubscriberStore, ages: tuple = None) -> tuple:
+        """Each subscriber's key in every tally, in row order (domains as index codes)"""
+        active = store.active_flags()
+        received, opened = store.received, store.opened
+        pairs = zip(received, opened)
+        active_pairs = zip(compress(received, active), compress(opened, active))
+
+        # Age bucket of each subscriber with a subscription date, skipping future dates
+        dated, past, buckets = ages or self._ages(store)
+        age_pairs = zip(buckets, compress(compress(received, dated), past), compress(compress(opened, dated), past))
+        category_pairs = zip(map(store.index.masks.__getitem__, store.domain_ids), received, opened)
+        days = map(floordiv, compress(store.subscribed, dated), repeat(SECONDS_PER_DAY))
+        return (pairs, active_pairs, age_pairs, store.domain_ids, compress(store.domain_ids, active), category_pairs,
+                days)
+
+    def update(self, store: SubscriberStore, remove: bool = False):
+        """Fold a columnar batch of subscribers into every section's accumulators, or take it back out"""
+        fold = Counter.subtract if remove else Counter.update
+        sign = -1 if remove else 1
+        ages = self._ages(store)
+        if remove:
+            self.in_row_order = False
+        elif self.in_row_order:
+            self._add_rate_sums(store, ages)
+        pairs, active_pairs, age_pairs, codes, active_codes, category_pairs, days = self._keys(store, ages)
+        fold(self.pairs, pairs)
+        fold(self.active_pairs, active_pairs)
+        fold(self.age_pairs, age_pairs)
+        fold(self.category_pairs, category_pairs)
+        fold(self.subscription_days, days)
+
+        domains = store.domains
+        for code, total in Counter(codes).items():
+            self.domain_total[domains[code]] += sign * total
+        for code, total in Counter(active_codes).items():
+            self.domain_active[domains[code]] += sign * total
+        if remove:
+            self.drop_empty()
+
+    def _add_rate_sums(self, store: SubscriberStore, ages: tuple):
+        """Add a batch's open rates to the row order sums, one subscriber at a time in row order"""
+        pairs = list(zip(store.received, store.opened))
+        # Individual open rates, 0.0 for subscribers who received no email, computed once per distinct pair
+        rate_of = {pair: open_rate(*pair) if pair[0] > 0 else 0.0 for pair in dict.fromkeys(pairs)}
+        rates = list(map(rate_of.__getitem__, pairs))
+        self.rate_sum = sum(rates, self.rate_sum)
+        self.active_rate_sum = sum(compress(rates, store.active_flags()), self.active_rate_sum)
+        # A stable sort groups each age bucket's rates, still in row order within the bucket
+        dated, past, buckets = ages
+        bucket_rates = list(compress(compress(rates, dated), past))
+        grouped = map(bucket_rates.__getitem__, sorted(range(len(buckets)), key=buckets.__getitem__))
+        for bucket, count in sorted(Counter(buckets).items()):
+            self.age_rate_sums[bucket] = sum(islice(grouped, count), self.age_rate_sums.get(bucket, 0.0))
+
+    def reorder(self, store: SubscriberStore):
+        """Re-key every tally in first-seen order over the store's rows, which decides dict and tie order"""
+        self.in_row_order = False  # The rate sums were added in another order
+        domains = store.domains
+        for name, keys in zip(self.TALLIES, self._keys(store)):
+            keys = dict.fromkeys(keys)
+            if name.startswith('domain'):
+                keys = map(domains.__getitem__, keys)
+            tally = getattr(self, name)
+            setattr(self, name, Counter({key: tally[key] for key in keys}))
+
+    def drop_empty(self):
+        """Forget keys whose counts fell to zero after removals"""
+        for tally in map(self.__getattribute__, self.TALLIES):
+            for key in [key for key, count in tally.items() if count <= 0]:
+                del tally[key]
+
+    def merge(self, other: 'ReportAccumulator'):
+        """Fold in another accumulator's partial results (covering rows after this one's)"""
+        if self.pairs or not (self.in_row_order and other.in_row_order):
+            self.in_row_order = False
+        else:
+            self.rate_sum, self.active_rate_sum = other.rate_sum, other.active_rate_sum
+            self.age_rate_sums = dict(other.age_rate_sums)
+        # Counter.update appends unseen keys in the other side's order, preserving first-seen order
+        self.pairs.update(other.pairs)
+        self.active_pairs.update(other.active_pairs)
+        self.age_pairs.update(other.age_pairs)
+        self.domain_total.update(other.domain_total)
+        self.domain_active.update(other.domain_active)
+        self.category_pairs.update(other.category_pairs)
+        self.subscription_days.update(other.subscription_days)
+
+    def age_stats(self) -> dict:
+        """Per age bucket: subscribers, open rate sum, open rate count and zero receives"""
+        tallies = {}
+        for (bucket, received, opened), subscribers in self.age_pairs.items():
+            tally = tallies.setdefault(bucket, Counter())
+            tally[received, opened] += subscribers
+        result = {}
+        for bucket, tally in tallies.items():
+            rate_sum, rate_count = sum_open_rates(tally)
+            if self.in_row_order:
+                rate_sum = self.age_rate_sums[bucket]
+            result[bucket] = {
+                'subscribers': sum(tally.values()),
+                'rate_sum': rate_sum,
+                'rate_count': rate_count,
+                'zero_receives': sum(n for (received, _), n in tally.items() if received == 0)
+            }
+        return result
+
+    def basic_stats(self) -> dict:
+        """Basic statistics section"""
+        total = sum(self.pairs.values())
+        never_opened = total - sum(self.active_pairs.values())
+        rate_sum, rate_count = sum_open_rates(self.pairs)
+        active_rate_sum, active_rate_count = sum_open_rates(self.active_pairs)
+        if self.in_row_order:
+            rate_sum, active_rate_sum = self.rate_sum, self.active_rate_sum
         return {
             'total_subscribers': total,
             'never_opened': never_opened,
             'never_opened_fraction': never_opened / total if total > 0 else 0,
-            'avg_open_rate': avg_open_rate,
-            'avg_open_rate_all': avg_open_rate_all,
-            'avg_open_rate_active_with_emails': avg_open_rate_active_with_emails,
-            'subscribers_with_emails': len(individual_open_rates),
-            'active_subscribers_with_emails': len(active_with_emails_open_rates)
+            'avg_open_rate': rate_sum / rate_count if rate_count else 0,
+            # Subscribers with 0 emails received count as 0% open rate
+            'avg_open_rate_all': rate_sum / total if total else 0,
+            'avg_open_rate_active_with_emails': active_rate_sum / active_rate_count if active_rate_count else 0,
+            'subscribers_with_emails': rate_count,
+            'active_subscribers_with_emails': active_rate_count
         }
-    
-    def analyze_subscription_age(self) -> dict:
-        """Analyze subscription age histogram"""
-        age_buckets = defaultdict(int)
-        
-        for subscriber in self.subscribers:
-            created_date = self.parse_date(subscriber.get('Subscription date', ''))
-            if created_date:
-                age_days = (self.current_date - created_date).days
-                # Skip future dates
-                if age_days < 0:
-                    continue
-                age_months = age_days / 30
-                
-                # Create buckets for every 6 months up to years_back years
-                bucket_index = min(int(age_months // 6), self.years_back * 2 - 1)
-                age_buckets[bucket_index] += 1
-        
-        return dict(age_buckets)
-    
-    def analyze_open_rates(self) -> dict:
-        """Analyze email open rates for last 6 months"""
-        open_rate_buckets = defaultdict(int)
-        zero_email_receives = 0
-        
-        for subscriber in self.subscribers:
-            # Get emails received and opened in last 6 months
-            emails_received = int(subscriber.get('Email receives (last 6 months)', 0) or 0)
-            emails_opened = int(subscriber.get('Emails opened (last 6 months)', 0) or 0)
-            
-            if emails_received > 0:
-                open_rate = (emails_opened / emails_received) * 100
-                bucket = min(int(open_rate // 10), 9)  # 0-9 for 0-100%
-                open_rate_buckets[bucket] += 1
+
+    def subscription_age(self) -> dict:
+        """Subscription age histogram section"""
+        return {bucket: stats['subscribers'] for bucket, stats in self.age_stats().items()}
+
+    def open_rates(self) -> dict:
+        """Open rate histogram section, by index in open_rate_buckets (0-9 for 0-100% by default)"""
+        result = defaultdict(int)
+        zero_receives = 0
+        rated = []
+        for (received, opened), subscribers in self.pairs.items():
+            if received > 0:
+                rated.append((open_rate(received, opened), subscribers))
             else:
-                zero_email_receives += 1
-        
-        result = dict(open_rate_buckets)
-        result['zero_receives'] = zero_email_receives
+                zero_receives += subscribers
+        for bucket, (_, subscribers) in zip(self.open_rate_buckets.assign(rate for rate, _ in rated), rated):
+            result[bucket] += subscribers
+        result = dict(result)
+        result['zero_receives'] = zero_receives
         return result
-    
-    def analyze_open_rates_by_age(self) -> dict:
-        """Analyze average email open rates by subscription age"""
-        age_open_stats = defaultdict(lambda: {'open_rates': [], 'subscriber_count': 0})
-        
-        for subscriber in self.subscribers:
-            created_date = self.parse_date(subscriber.get('Subscription date', ''))
-            if not created_date:
-                continue
-                
-            age_days = (self.current_date - created_date).days
-            # Skip future dates
-            if age_days < 0:
-                continue
-            age_months = age_days / 30
-            
-            # Create buckets for every 6 months up to years_back years
-            bucket_index = min(int(age_months // 6), self.years_back * 2 - 1)
-            
-            # Get emails received and opened in last 6 months
-            emails_received = int(subscriber.get('Email receives (last 6 months)', 0) or 0)
-            emails_opened = int(subscriber.get('Emails opened (last 6 months)', 0) or 0)
-            
-            # Calculate individual open rate
-            if emails_received > 0:
-                individual_open_rate = (emails_opened / emails_received) * 100
-                age_open_stats[bucket_index]['open_rates'].append(individual_open_rate)
-            
-            age_open_stats[bucket_index]['subscriber_count'] += 1
-        
-        # Calculate average of individual open rates for each age bucket
+
+    def age_histograms(self) -> dict:
+        """Subscription age histogram for each width in age_views, all from the one tally of subscription days
+
+        Ages here are whole calendar days between the subscription and analysis dates.
+        """
+        today = self.now // SECONDS_PER_DAY
+        ages = [(today - day, subscribers) for day, subscribers in self.subscription_days.items() if day <= today]
         result = {}
-        for bucket, stats in age_open_stats.items():
-            if stats['open_rates']:
-                # True average: mean of individual open rates
-                avg_open_rate = sum(stats['open_rates']) / len(stats['open_rates'])
-            else:
-                avg_open_rate = 0
-            result[bucket] = {
-                'avg_open_rate': avg_open_rate,
-                'subscriber_count': stats['subscriber_count']
-            }
-        
+        for months in self.age_views:
+            histogram = Counter()
+            for bucket, (_, subscribers) in zip(self.view_buckets(months).assign(age for age, _ in ages), ages):
+                histogram[bucket] += subscribers
+            result[months] = dict(sorted(histogram.items()))
         return result
-    
-    def analyze_open_rates_by_age_all(self) -> dict:
-        """Analyze average email open rates by subscription age (including zero email receives)"""
-        age_open_stats = defaultdict(lambda: {'open_rates': [], 'subscriber_count': 0})
-        
-        for subscriber in self.subscribers:
-            created_date = self.parse_date(subscriber.get('Subscription date', ''))
-            if not created_date:
-                continue
-                
-            age_days = (self.current_date - created_date).days
-            # Skip future dates
-            if age_days < 0:
-                continue
-            age_months = age_days / 30
-            
-            # Create buckets for every 6 months up to years_back years
-            bucket_index = min(int(age_months // 6), self.years_back * 2 - 1)
-            
-            # Get emails received and opened in last 6 months
-            emails_received = int(subscriber.get('Email receives (last 6 months)', 0) or 0)
-            emails_opened = int(subscriber.get('Emails opened (last 6 months)', 0) or 0)
-            
-            # Calculate individual open rate (including 0% for zero receives)
-            if emails_received > 0:
-                individual_open_rate = (emails_opened / emails_received) * 100
-            else:
-                individual_open_rate = 0.0
-            
-            age_open_stats[bucket_index]['open_rates'].append(individual_open_rate)
-            age_open_stats[bucket_index]['subscriber_count'] += 1
-        
-        # Calculate average of individual open rates for each age bucket
-        result = {}
-        for bucket, stats in age_open_stats.items():
-            if stats['open_rates']:
-                # True average: mean of individual open rates (including zeros)
-                avg_open_rate = sum(stats['open_rates']) / len(stats['open_rates'])
-            else:
-                avg_open_rate = 0
-            result[bucket] = {
-                'avg_open_rate': avg_open_rate,
-                'subscriber_count': stats['subscriber_count']
+
+    def view_buckets(self, months: int) -> Buckets:
+        """Buckets of one of the age_views"""
+        now = EPOCH + timedelta(seconds=self.now) if self.calendar_months else None
+        return age_buckets(months, self.years_back, now)
+
+    def open_rates_by_age(self) -> dict:
+        """Average open rate by subscription age, over subscribers with emails received"""
+        return {
+            bucket: {
+                'avg_open_rate': stats['rate_sum'] / stats['rate_count'] if stats['rate_count'] else 0,
+                'subscriber_count': stats['subscribers']
             }
-        
-        return result
-    
-    def analyze_zero_receives_by_age(self) -> dict:
-        """Analyze percentage of subscribers with 0 email receives by subscription age"""
-        age_stats = defaultdict(lambda: {'total': 0, 'zero_receives': 0})
-        
-        for subscriber in self.subscribers:
-            created_date = self.parse_date(subscriber.get('Subscription date', ''))
-            if not created_date:
-                continue
-                
-            age_days = (self.current_date - created_date).days
-            # Skip future dates
-            if age_days < 0:
-                continue
-            age_months = age_days / 30
-            
-            # Create buckets for every 6 months up to years_back years
-            bucket_index = min(int(age_months // 6), self.years_back * 2 - 1)
-            
-            # Get emails received in last 6 months
-            emails_received = int(subscriber.get('Email receives (last 6 months)', 0) or 0)
-            
-            age_stats[bucket_index]['total'] += 1
-            if emails_received == 0:
-                age_stats[bucket_index]['zero_receives'] += 1
-        
-        # Calculate percentage for each age bucket
-        result = {}
-        for bucket, stats in age_stats.items():
-            if stats['total'] > 0:
-                zero_percent = (stats['zero_receives'] / stats['total']) * 100
-            else:
-                zero_percent = 0
-            result[bucket] = {
-                'zero_percent': zero_percent,
+            for bucket, stats in self.age_stats().items()
+        }
+
+    def open_rates_by_age_all(self) -> dict:
+        """Average open rate by subscription age, counting zero email receives as 0%"""
+        return {
+            bucket: {
+                'avg_open_rate': stats['rate_sum'] / stats['subscribers'],
+                'subscriber_count': stats['subscribers']
+            }
+            for bucket, stats in self.age_stats().items()
+        }
+
+    def zero_receives_by_age(self) -> dict:
+        """Percentage of subscribers with 0 email receives by subscription age"""
+        return {
+            bucket: {
+                'zero_percent': (stats['zero_receives'] / stats['subscribers']) * 100,
                 'zero_count': stats['zero_receives'],
-                'total_count': stats['total']
+                'total_count': stats['subscribers']
             }
-        
-        return result
-    
-    def analyze_edu_emails(self) -> dict:
-        """Analyze .edu email addresses"""
+            for bucket, stats in self.age_stats().items()
+        }
+
+    def open_rate_distribution(self) -> dict:
+        """Open rate mean, spread and percentiles overall, by subscription age and by domain category"""
+        by_age = {}
+        for (bucket, received, opened), subscribers in self.age_pairs.items():
+            by_age.setdefault(bucket, Counter())[received, opened] += subscribers
+        categories = {**CATEGORIES, **self.index.registry.bits}
+        by_category = {name: Counter() for name in categories}
+        for (mask, received, opened), subscribers in self.category_pairs.items():
+            for name, bit in categories.items():
+                if mask & bit:
+                    by_category[name][received, opened] += subscribers
+        return {
+            'overall': open_rate_summary(self.pairs),
+            'by_age': {bucket: open_rate_summary(tally) for bucket, tally in by_age.items()},
+            'by_category': {name: open_rate_summary(tally) for name, tally in by_category.items()}
+        }
+
+    def custom_categories(self) -> dict:
+        """Totals and top 10 labels (or domains) of every registry category, from one walk over the domains"""
+        registry = self.index.registry
+        stats = {name: {'total': 0, 'active': 0, 'by_label': {}} for name in registry.names}
+        first_bit = BUILTIN_CATEGORIES.bit_length()
+        for domain, total, active, mask in self.classified_domains(~BUILTIN_CATEGORIES):
+            bits = mask >> first_bit
+            while bits:
+                name = registry.names[(bits & -bits).bit_length() - 1]
+                bits &= bits - 1
+                category = stats[name]
+                category['total'] += total
+                category['active'] += active
+                group = category['by_label'].setdefault(registry.label(name, domain), {'total': 0, 'active': 0})
+                group['total'] += total
+                group['active'] += active
+
+        for category in stats.values():
+            by_label = category.pop('by_label')
+            category['top_10'] = dict(sorted(by_label.items(), key=lambda x: x[1]['total'], reverse=True)[:10])
+        return stats
+
+    def classified_domains(self, categories: int):
+        """(domain, total, active, category bits) for each domain in any of the categories, in first-seen order"""
+        masks = self.index.masks
+        intern = self.index.intern
+        for domain, total in self.domain_total.items():
+            mask = masks[intern(domain)]
+            if mask & categories:
+                yield domain, total, self.domain_active[domain], mask
+
+    def edu_emails(self) -> dict:
+        """.edu section"""
         edu_stats = {
             'total': 0,
             'active': 0,
@@ -439,92 +1625,74 @@ class EmailAnalyzer:
             'top_10': Counter(),
             'top_10_active': Counter()
         }
-        
+
         # Initialize prominent domains
         for domain in PROMINENT_EDU_EMAILS:
             edu_stats['prominent']['by_domain'][domain] = {'total': 0, 'active': 0}
-        
-        for subscriber in self.subscribers:
-            email = subscriber.get('Email', '').lower()
-            domain = self.get_domain(email)
-            
-            if domain.endswith('.edu'):
-                edu_stats['total'] += 1
-                if self.is_active(subscriber):
-                    edu_stats['active'] += 1
-                    edu_stats['top_10_active'][domain] += 1
-                edu_stats['top_10'][domain] += 1
-                
-                if domain in PROMINENT_EDU_EMAILS:
-                    edu_stats['prominent']['total'] += 1
-                    edu_stats['prominent']['by_domain'][domain]['total'] += 1
-                    if self.is_active(subscriber):
-                        edu_stats['prominent']['active'] += 1
-                        edu_stats['prominent']['by_domain'][domain]['active'] += 1
-        
+
+        for domain, total, active, mask in self.classified_domains(EDU):
+            edu_stats['total'] += total
+            edu_stats['active'] += active
+            edu_stats['top_10'][domain] = total
+
+            if mask & PROMINENT_EDU:
+                edu_stats['prominent']['total'] += total
+                edu_stats['prominent']['active'] += active
+                edu_stats['prominent']['by_domain'][domain] = {'total': total, 'active': active}
+
+        # Active counts keep the order in which each domain was first seen active
+        for domain, active in self.domain_active.items():
+            if self.index.mask(domain) & EDU:
+                edu_stats['top_10_active'][domain] = active
+
         # Get top 10
         edu_stats['top_10'] = dict(edu_stats['top_10'].most_common(10))
         edu_stats['top_10_active'] = dict(edu_stats['top_10_active'].most_common(10))
-        
+
         return edu_stats
-    
-    def analyze_corporation_emails(self) -> dict:
-        """Analyze major corporation emails"""
+
+    def corporation_emails(self) -> dict:
+        """Fortune 100 section"""
         corp_stats = {
             'total': 0,
             'active': 0,
             'by_company': defaultdict(lambda: {'total': 0, 'active': 0})
         }
-        
-        for subscriber in self.subscribers:
-            email = subscriber.get('Email', '').lower()
-            domain = self.get_domain(email)
-            
-            if domain in FORTUNE_100_EMAILS:
-                corp_stats['total'] += 1
-                
-                # Get company name
-                company_name = COMPANY_NAME_MAPPING.get(domain, domain)
-                corp_stats['by_company'][company_name]['total'] += 1
-                
-                if self.is_active(subscriber):
-                    corp_stats['active'] += 1
-                    corp_stats['by_company'][company_name]['active'] += 1
-        
+
+        for domain, total, active, _ in self.classified_domains(FORTUNE_100):
+            corp_stats['total'] += total
+            corp_stats['active'] += active
+
+            # Get company name
+            company = corp_stats['by_company'][self.index.companies[self.index.intern(domain)]]
+            company['total'] += total
+            company['active'] += active
+
         # Get top 10 companies
         top_companies = sorted(
             corp_stats['by_company'].items(),
             key=lambda x: x[1]['total'],
             reverse=True
         )[:10]
-        
+
         corp_stats['top_10'] = dict(top_companies)
         del corp_stats['by_company']  # Remove full list to keep output clean
-        
+
         return corp_stats
-    
-    def analyze_vc_startup_emails(self) -> dict:
-        """Analyze VC and startup emails"""
+
+    def vc_startup_emails(self) -> dict:
+        """VC and startup section"""
         vc_stats = {'total': 0, 'active': 0, 'by_domain': {}}
-        
-        for subscriber in self.subscribers:
-            email = subscriber.get('Email', '').lower()
-            domain = self.get_domain(email)
-            
-            if domain in VC_STARTUP_EMAILS:
-                vc_stats['total'] += 1
-                if domain not in vc_stats['by_domain']:
-                    vc_stats['by_domain'][domain] = {'total': 0, 'active': 0}
-                vc_stats['by_domain'][domain]['total'] += 1
-                
-                if self.is_active(subscriber):
-                    vc_stats['active'] += 1
-                    vc_stats['by_domain'][domain]['active'] += 1
-        
+
+        for domain, total, active, _ in self.classified_domains(VC_STARTUP):
+            vc_stats['total'] += total
+            vc_stats['active'] += active
+            vc_stats['by_domain'][domain] = {'total': total, 'active': active}
+
         return vc_stats
-    
-    def analyze_government_emails(self) -> dict:
-        """Analyze government emails"""
+
+    def government_emails(self) -> dict:
+        """Government section"""
         gov_stats = {
             'total': 0,
             'active': 0,
@@ -532,126 +1700,867 @@ class EmailAnalyzer:
             'prominent': {'total': 0, 'active': 0, 'by_domain': {}},
             'states': {'total': 0, 'active': 0}
         }
-        
-        for subscriber in self.subscribers:
-            email = subscriber.get('Email', '').lower()
-            domain = self.get_domain(email)
-            
-            if '.gov' in domain:
-                gov_stats['total'] += 1
-                gov_stats['top_10_domains'][domain] += 1
-                
-                if self.is_active(subscriber):
-                    gov_stats['active'] += 1
-                
-                # Check prominent domains
-                for prom_domain in PROMINENT_GOV_EMAILS:
-                    if prom_domain in domain:
-                        gov_stats['prominent']['total'] += 1
-                        if prom_domain not in gov_stats['prominent']['by_domain']:
-                            gov_stats['prominent']['by_domain'][prom_domain] = {'total': 0, 'active': 0}
-                        gov_stats['prominent']['by_domain'][prom_domain]['total'] += 1
-                        
-                        if self.is_active(subscriber):
-                            gov_stats['prominent']['active'] += 1
-                            gov_stats['prominent']['by_domain'][prom_domain]['active'] += 1
-                
-                # Check state domains
-                if domain in STATE_GOV_EMAILS:
-                    gov_stats['states']['total'] += 1
-                    if self.is_active(subscriber):
-                        gov_stats['states']['active'] += 1
-        
+
+        for domain, total, active, mask in self.classified_domains(GOV):
+            gov_stats['total'] += total
+            gov_stats['active'] += active
+            gov_stats['top_10_domains'][domain] = total
+
+            # Prominent rules the domain contains
+            for prom_domain in self.index.gov_matches.get(self.index.intern(domain), ()):
+                gov_stats['prominent']['total'] += total
+                gov_stats['prominent']['active'] += active
+                if prom_domain not in gov_stats['prominent']['by_domain']:
+                    gov_stats['prominent']['by_domain'][prom_domain] = {'total': 0, 'active': 0}
+                gov_stats['prominent']['by_domain'][prom_domain]['total'] += total
+                gov_stats['prominent']['by_domain'][prom_domain]['active'] += active
+
+            if mask & STATE_GOV:
+                gov_stats['states']['total'] += total
+                gov_stats['states']['active'] += active
+
         gov_stats['top_10_domains'] = dict(gov_stats['top_10_domains'].most_common(10))
-        
+
         return gov_stats
-    
-    def analyze_media_emails(self) -> dict:
-        """Analyze media organization emails"""
+
+    def media_emails(self) -> dict:
+        """Media section"""
         media_stats = {
             'total': 0,
             'active': 0,
             'by_outlet': {}
         }
-        
+
         for outlet in MEDIA_EMAILS:
             media_stats['by_outlet'][outlet] = {'total': 0, 'active': 0}
-        
-        for subscriber in self.subscribers:
-            email = subscriber.get('Email', '').lower()
-            domain = self.get_domain(email)
-            
-            if domain in MEDIA_EMAILS:
-                media_stats['total'] += 1
-                media_stats['by_outlet'][domain]['total'] += 1
-                
-                if self.is_active(subscriber):
-                    media_stats['active'] += 1
-                    media_stats['by_outlet'][domain]['active'] += 1
-        
+
+        for domain, total, active, _ in self.classified_domains(MEDIA):
+            media_stats['total'] += total
+            media_stats['active'] += active
+            media_stats['by_outlet'][domain] = {'total': total, 'active': active}
+
         # Remove outlets with 0 subscribers for cleaner output
-        media_stats['by_outlet'] = {k: v for k, v in media_stats['by_outlet'].items() 
+        media_stats['by_outlet'] = {k: v for k, v in media_stats['by_outlet'].items()
                                    if v['total'] > 0}
-        
+
         return media_stats
-    
-    def analyze_org_emails(self) -> dict:
-        """Analyze .org emails including philanthropy, nonprofits, and think tanks"""
+
+    def org_emails(self) -> dict:
+        """Philanthropy, nonprofit and think tank section"""
         org_stats = {
             'top_10_org': Counter(),
             'major_orgs': {},
             'all_philanthropy': {'total': 0, 'active': 0}
         }
-        
+
         # Initialize major orgs
         for org in MAJOR_PHILANTHROPY_EMAILS:
             org_stats['major_orgs'][org] = {'total': 0, 'active': 0}
-        
-        for subscriber in self.subscribers:
-            email = subscriber.get('Email', '').lower()
-            domain = self.get_domain(email)
-            
+
+        for domain, total, active, mask in self.classified_domains(ORG | MAJOR_PHILANTHROPY | ALL_PHILANTHROPY):
             # Count all .org domains
-            if domain.endswith('.org'):
-                org_stats['top_10_org'][domain] += 1
-            
+            if mask & ORG:
+                org_stats['top_10_org'][domain] = total
+
             # Check major organizations
-            if domain in MAJOR_PHILANTHROPY_EMAILS:
-                org_stats['major_orgs'][domain]['total'] += 1
-                if self.is_active(subscriber):
-                    org_stats['major_orgs'][domain]['active'] += 1
-            
+            if mask & MAJOR_PHILANTHROPY:
+                org_stats['major_orgs'][domain] = {'total': total, 'active': active}
+
             # Check all philanthropy organizations
-            if domain in ALL_PHILANTHROPY_EMAILS:
-                org_stats['all_philanthropy']['total'] += 1
-                if self.is_active(subscriber):
-                    org_stats['all_philanthropy']['active'] += 1
-        
+            if mask & ALL_PHILANTHROPY:
+                org_stats['all_philanthropy']['total'] += total
+                org_stats['all_philanthropy']['active'] += active
+
         # Get top 10 .org domains
         org_stats['top_10_org'] = dict(org_stats['top_10_org'].most_common(10))
-        
+
         # Remove orgs with 0 subscribers
-        org_stats['major_orgs'] = {k: v for k, v in org_stats['major_orgs'].items() 
+        org_stats['major_orgs'] = {k: v for k, v in org_stats['major_orgs'].items()
                                   if v['total'] > 0}
-        
+
         return org_stats
+
+
+def age_bucket(created: int, now: int, buckets: Buckets) -> int:
+    """Subscription age bucket of one subscriber, or None if undated or in the future"""
+    if created <= UNPARSED_DATE:
+        return None
+    age_days = (now - created) // SECONDS_PER_DAY
+    if age_days < 0:
+        return None
+    return buckets.bucket(age_days)
+
+
+def _row_signature(fields: tuple) -> int:
+    """Hash of the fields the analysis reads from a row, to spot changed subscribers"""
+    return int.from_bytes(hashlib.blake2b('\x1f'.join(fields).encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class IncrementalState:
+    """Snapshot of the last export keyed by Email, together with the accumulators it produced
+
+    refresh() diffs a new export against the snapshot and folds only the added, removed and
+    changed rows into the persisted accumulators, plus the subscribers whose age bucket
+    rolled over since the previous run. The CSV is still read to find the diff, but dates,
+    domains and tallies are only recomputed for rows that changed. Unless rows were only
+    appended, the tallies are then re-keyed in file order, which is a pass over every row.
+    """
+
+    VERSION = 4
+
+    def __init__(self, analyzer: 'EmailAnalyzer'):
+        self.version = self.VERSION
+        self.years_back = analyzer.years_back
+        self.categories = analyzer.domain_index.registry.digest()
+        self.store = SubscriberStore(DomainIndex(analyzer.domain_index.registry))  # Typed values per slot
+        self.signatures = array('Q')    # Slot -> hash of the row's analysed fields
+        self.slot_keys = []             # Slot -> (email, occurrence), None once removed
+        self.alive = bytearray()        # Slot -> 1 while it holds a subscriber
+        self.keys = {}                  # (email, occurrence) -> slot
+        self.free = []                  # Removed slots, reused for new rows
+        self.days = {}                  # Subscription day -> slots, to find subscribers changing age bucket
+        self.order = array('q')         # Slot of every row in the last export, in file order
+        self.accumulator = ReportAccumulator(analyzer)
+        self.accumulator.index = self.store.index
+
+    @classmethod
+    def load(cls, path: str, analyzer: 'EmailAnalyzer') -> 'IncrementalState':
+        """Load a snapshot, or return None if it is missing or was built with other settings"""
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, EOFError, AttributeError, pickle.UnpicklingError):
+            return None
+        registry = analyzer.domain_index.registry
+        if (not isinstance(state, cls) or state.version != cls.VERSION
+                or state.years_back != analyzer.years_back or state.categories != registry.digest()):
+            return None
+        state.store.index = DomainIndex.of(state.store.domains, registry)
+        accumulator = state.accumulator
+        accumulator.index = state.store.index
+        accumulator.open_rate_buckets = analyzer.open_rate_buckets
+        accumulator.age_views = analyzer.age_views
+        accumulator.calendar_months = analyzer.calendar_months
+        return state
+
+    def save(self, path: str):
+        """Write the snapshot through a temporary file"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def refresh(self, analyzer: 'EmailAnalyzer') -> Dict[str, int]:
+        """Bring the snapshot and accumulators up to date with the analyzer's CSV"""
+        changes = {'added': 0, 'changed': 0, 'removed': 0,
+                   'aged': self._age(to_epoch_seconds(analyzer.current_date))}
+        seen = bytearray(len(self.slot_keys))
+        occurrences = Counter()
+        order = array('q')  # Slot of every row, in file order
+        fresh = []          # (slot or None, key, signature, fields, position) of new and changed rows
+
+        for fields in analyzer.read_rows():
+            email = fields[0]
+            occurrences[email] += 1
+            key = (email, occurrences[email])
+            signature = _row_signature(fields)
+            slot = self.keys.get(key)
+            if slot is None:
+                changes['added'] += 1
+            else:
+                seen[slot] = 1
+                if self.signatures[slot] == signature:
+                    order.append(slot)
+                    continue
+                changes['changed'] += 1
+            fresh.append((slot, key, signature, fields, len(order)))
+            order.append(-1)
+            if len(fresh) >= EXTEND_BATCH_SIZE:
+                self._apply(fresh, order, seen, analyzer)
+                fresh = []
+        self._apply(fresh, order, seen, analyzer)
+
+        removed = list(compress(range(len(seen)), map(gt, self.alive, seen)))
+        if removed:
+            changes['removed'] = len(removed)
+            self.accumulator.update(self.store.take(removed), remove=True)
+            for slot in removed:
+                self._unindex(slot)
+                del self.keys[self.slot_keys[slot]]
+                self.slot_keys[slot] = None
+                self.alive[slot] = 0
+                self.free.append(slot)
+
+        # Tallies keep first-seen key order, which depends on where rows sit in the new export. When
+        # the previous rows are all unchanged and in place, with any new ones after them, the rows were
+        # already folded in file order; otherwise the tallies are re-keyed over every row.
+        appended = (not (changes['changed'] or changes['removed'] or changes['aged'])
+                    and order[:len(self.order)] == self.order)
+        if not appended:
+            self.accumulator.reorder(self.store.take(order))
+        self.order = order
+        return changes
+
+    def _apply(self, fresh: list, order: array, seen: bytearray, analyzer: 'EmailAnalyzer'):
+        """Swap the old values of changed rows for the parsed new and changed rows"""
+        if not fresh:
+            return
+        store = self.store
+        stale = [slot for slot, *_ in fresh if slot is not None]
+        if stale:
+            self.accumulator.update(store.take(stale), remove=True)
+            for slot in stale:
+                self._unindex(slot)
+
+        delta = SubscriberStore(store.index)
+        rows = [fields for _, _, _, fields, _ in fresh]
+        delta.extend(rows, analyzer.get_domain, analyzer.date_parsers, analyzer.profiler)
+        self.accumulator.update(delta)
+        for index, (slot, key, signature, _, position) in enumerate(fresh):
+            if slot is None:
+                slot = self._allocate(key)
+                if slot < len(seen):
+                    seen[slot] = 1  # A reused slot is not a removal
+            store.put(slot, delta, index)
+            self.signatures[slot] = signature
+            self._index(slot)
+            order[position] = slot
+
+    def _allocate(self, key: tuple) -> int:
+        if self.free:
+            slot = self.free.pop()
+            self.slot_keys[slot] = key
+            self.alive[slot] = 1
+        else:
+            slot = len(self.slot_keys)
+            self.slot_keys.append(key)
+            self.alive.append(1)
+            self.signatures.append(0)
+        self.keys[key] = slot
+        return slot
+
+    def _index(self, slot: int):
+        created = self.store.subscribed[slot]
+        if created > UNPARSED_DATE:
+            self.days.setdefault(created // SECONDS_PER_DAY, set()).add(slot)
+
+    def _unindex(self, slot: int):
+        created = self.store.subscribed[slot]
+        if created > UNPARSED_DATE:
+            day = created // SECONDS_PER_DAY
+            self.days[day].discard(slot)
+            if not self.days[day]:
+                del self.days[day]
+
+    def _age(self, now: int) -> int:
+        """Move subscribers whose age bucket changed between the snapshot's date and now"""
+        accumulator = self.accumulator
+        then = accumulator.now
+        accumulator.now = now
+        if now == then:
+            return 0
+
+        # Buckets only change where the age in days crosses a bucket edge
+        low, high = min(then, now), max(then, now)
+        candidates = set()
+        for threshold in accumulator.age_buckets.edges:
+            offset = threshold * SECONDS_PER_DAY
+            for day in range((low - offset) // SECONDS_PER_DAY, (high - offset) // SECONDS_PER_DAY + 1):
+                candidates.update(self.days.get(day, ()))
+
+        store = self.store
+        moved = 0
+        for slot in candidates:
+            old = age_bucket(store.subscribed[slot], then, accumulator.age_buckets)
+            new = age_bucket(store.subscribed[slot], now, accumulator.age_buckets)
+            if old != new:
+                pair = (store.received[slot], store.opened[slot])
+                if old is not None:
+                    accumulator.age_pairs[(old,) + pair] -= 1
+                if new is not None:
+                    accumulator.age_pairs[(new,) + pair] += 1
+                moved += 1
+        accumulator.drop_empty()
+        return moved
+
+
+
+def _peak_rss() -> int:
+    """High-water resident set size of this process in bytes, or 0 where unavailable"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+@contextlib.contextmanager
+def _no_stage(name: str, rows: int = 0):
+    yield {}
+
+
+class StageProfiler:
+    """Per-stage wall time, CPU time, rows and peak memory growth, written as JSON by --profile
+
+    Stages are timed with stage() blocks; repeated stages (one per batch, say) add up into one
+    entry, and nested stages are also counted in their parent. The peak memory delta is how
+    far the process's resident set high-water mark rose during the stage.
+    """
+
+    def __init__(self):
+        self.stages = {}  # name -> totals, in first-run order
+        self.started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name: str, rows: int = 0):
+        """Time the enclosed block; it may set the yielded dict's 'rows' once it knows them"""
+        timing = {'rows': rows}
+        peak = _peak_rss()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield timing
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            totals = self.stages.setdefault(name, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                   'rows': 0, 'peak_rss_delta_bytes': 0})
+            totals['calls'] += 1
+            totals['wall_seconds'] += wall
+            totals['cpu_seconds'] += cpu
+            totals['rows'] += timing['rows']
+            totals['peak_rss_delta_bytes'] += _peak_rss() - peak
+
+    def report(self) -> dict:
+        """Totals per stage, with rows per second of wall time"""
+        stages = []
+        for name, totals in self.stages.items():
+            wall = totals['wall_seconds']
+            stages.append({'stage': name, **totals,
+                           'rows_per_second': round(totals['rows'] / wall) if totals['rows'] and wall else None})
+        return {'wall_seconds': time.perf_counter() - self.started, 'peak_rss_bytes': _peak_rss() or None,
+                'stages': stages}
+
+    def save(self, path: str, **context):
+        """Write the report as JSON, along with any context such as the CSV file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({**context, **self.report()}, f, indent=2)
+
+
+def _profiled(method):
+    """Time an EmailAnalyzer method as a stage of the same name when profiling is on"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.profiler is None:
+            return method(self, *args, **kwargs)
+        with self.profiler.stage(method.__name__) as timing:
+            result = method(self, *args, **kwargs)
+            timing['rows'] = self.rows_processed()
+        return result
+    return wrapper
+
+
+def domain_breakdowns(result: dict, prefix: str = ''):
+    """(breakdown, name, total, active) for every per-domain, company or label breakdown in a domain section
+
+    Breakdowns are found by shape, nested anywhere in the section's result: a dict of counts,
+    or of {'total', 'active'} stats. Dicts with a 'total' of their own are groups and are
+    searched in turn. Counts without an active split (such as top_10_org) have active None,
+    unless a sibling '<breakdown>_active' dict holds them.
+    """
+    for key, value in result.items():
+        if not isinstance(value, dict) or (str(key).endswith('_active') and str(key)[:-len('_active')] in result):
+            continue
+        breakdown = f"{prefix}{key}"
+        if 'total' in value:
+            yield from domain_breakdowns(value, breakdown + '.')
+        elif all(isinstance(count, int) for count in value.values()):
+            active = result.get(f"{key}_active")
+            for name, total in value.items():
+                yield breakdown, name, total, None if active is None else active.get(name, 0)
+        else:
+            for name, stats in value.items():
+                yield breakdown, name, stats['total'], stats['active']
+
+
+class JsonReportWriter:
+    """Streams a report document to a file as JSON: the header's fields, then 'sections' by name
+
+    Each section is serialized as it arrives, so the document is never held whole in memory.
+    Bucket-keyed results keep their bucket indexes as keys (strings, in JSON), which index
+    the header's label lists.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.sections = 0
+
+    def header(self, header: dict):
+        self.f.write(json.dumps(header)[:-1] + ', "sections": {')
+
+    def section(self, section: str, result: dict):
+        self.f.write((', ' if self.sections else '') + json.dumps(section) + ': ' + json.dumps(result))
+        self.sections += 1
+
+    def end(self):
+        self.f.write('}}\n')
+
+
+class ReportTables:
+    """Writes the histograms and domain breakdowns of a report document as CSV tables in a directory
+
+    Each table is a long-format CSV, created when its first section arrives and written row
+    by row: bucketed sections get the bucket's label from the document header, and the
+    domains table has a row per domain, company or label of every domain section.
+    """
+
+    COLUMNS = {
+        'subscription_age': ('bucket', 'label', 'subscribers'),
+        'age_histograms': ('months', 'bucket', 'label', 'subscribers'),
+        'open_rates': ('bucket', 'label', 'subscribers'),
+        'open_rates_by_age': ('section', 'bucket', 'label', 'subscribers', 'avg_open_rate'),
+        'zero_receives_by_age': ('bucket', 'label', 'subscribers', 'zero_receives', 'zero_percent'),
+        'open_rate_distribution': ('group', 'name', 'count', 'mean', 'std') +
+                                  tuple(f"p{percentile}" for percentile in OPEN_RATE_PERCENTILES),
+        'domains': ('section', 'breakdown', 'name', 'total', 'active'),
+    }
+    DOMAIN_SECTIONS = ('edu_emails', 'corporation_emails', 'vc_startup_emails', 'government_emails',
+                       'media_emails', 'org_emails', 'custom_categories')
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.labels = {}
+        self.files = {}
+        self.writers = {}
+
+    def __enter__(self) -> 'ReportTables':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.end()
+
+    def write(self, table: str, row: tuple):
+        writer = self.writers.get(table)
+        if writer is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.files[table] = open(os.path.join(self.directory, f"{table}.csv"), 'w', newline='', encoding='utf-8')
+            writer = self.writers[table] = csv.writer(self.files[table])
+            writer.writerow(self.COLUMNS[table])
+        writer.writerow(row)
+
+    def header(self, header: dict):
+        # Labels without the padding that aligns them in the text report
+        strip = partial(map, str.strip)
+        self.labels = {'age_buckets': list(strip(header['age_buckets'])),
+                       'open_rate_buckets': list(strip(header['open_rate_buckets'])),
+                       'age_views': {months: list(strip(labels)) for months, labels in header['age_views'].items()}}
+
+    def section(self, section: str, result: dict):
+        age_labels = self.labels['age_buckets']
+        if section == 'subscription_age':
+            for bucket, subscribers in sorted(result.items()):
+                self.write(section, (bucket, age_labels[bucket], subscribers))
+        elif section == 'age_histograms':
+            for months, histogram in result.items():
+                labels = self.labels['age_views'][months]
+                for bucket, subscribers in histogram.items():
+                    self.write(section, (months, bucket, labels[bucket], subscribers))
+        elif section == 'open_rates':
+            labels = self.labels['open_rate_buckets']
+            for bucket, subscribers in sorted((bucket, n) for bucket, n in result.items() if bucket != 'zero_receives'):
+                self.write(section, (bucket, labels[bucket], subscribers))
+            self.write(section, ('', '0 email receives', result.get('zero_receives', 0)))
+        elif section in ('open_rates_by_age', 'open_rates_by_age_all'):
+            for bucket, stats in sorted(result.items()):
+                self.write('open_rates_by_age', (section, bucket, age_labels[bucket], stats['subscriber_count'],
+                                                 stats['avg_open_rate']))
+        elif section == 'zero_receives_by_age':
+            for bucket, stats in sorted(result.items()):
+                self.write(section, (bucket, age_labels[bucket], stats['total_count'], stats['zero_count'],
+                                     stats['zero_percent']))
+        elif section == 'open_rate_distribution':
+            groups = [('overall', '', result['overall'])]
+            groups += [('age', age_labels[bucket], stats) for bucket, stats in sorted(result['by_age'].items())]
+            groups += [('category', category, stats) for category, stats in result['by_category'].items()]
+            for group, name, stats in groups:
+                self.write(section, (group, name) + tuple(stats[column] for column in self.COLUMNS[section][2:]))
+        elif section in self.DOMAIN_SECTIONS:
+            for row in domain_breakdowns(result):
+                self.write('domains', (section,) + row)
+
+    def end(self):
+        for f in self.files.values():
+            f.close()
+        self.files.clear()
+
+
+class EmailAnalyzer:
+    def __init__(self, csv_file: str, years_back: int = 6, chunk_size: int = 0, workers: int = 1,
+                 cache: ExportCache = None, incremental: str = None, profiler: StageProfiler = None,
+                 use_mmap: bool = True, domain_index: DomainIndex = None, age_views: Tuple[int, ...] = (),
+                 calendar_months: bool = False, open_rate_buckets: Buckets = None, registry: CategoryRegistry = None,
+                 sections: Tuple[str, ...] = None, segment: str = None):
+        self.csv_file = csv_file
+        self.years_back = years_back
+        # Report histograms: 6-month age buckets, plus a histogram per width in months in age_views
+        self.age_buckets = age_buckets(6, years_back)
+        self.age_views = tuple(age_views)
+        self.calendar_months = calendar_months
+        self.open_rate_buckets = open_rate_buckets or OPEN_RATE_BUCKETS
+        # Report sections to compute and render, in report order, and the CSV columns parsed for them.
+        # Incremental snapshots need every column, as later runs may ask for other sections.
+        self.sections = tuple(section for section in SECTION_COLUMNS if sections is None or section in sections)
+        self.columns = ANALYSIS_COLUMNS if sections is None or incremental or segment else section_columns(self.sections)
+        # When set, only the subscribers matching this segment filter (see parse_segment) are analyzed;
+        # the export is then loaded whole to build the SegmentIndex
+        self.segment = segment
+        self.segment_rows = None  # Once analyzed, a 0/1 flag per loaded row for whether it matches segment
+        # When set, the CSV is streamed in chunks of this many rows instead of loaded whole
+        self.chunk_size = chunk_size
+        # More than one worker splits the CSV into byte ranges analyzed on a process pool
+        self.workers = workers
+        # Parsed columns are reused from this cache when the CSV is unchanged
+        self.cache = cache
+        # Snapshot file of the previous run; only the rows that changed since are re-analyzed
+        self.incremental = incremental
+        self.changes = None
+        # Collects per-stage timings when set (--profile)
+        self.profiler = profiler
+        # Tokenize the memory-mapped file directly rather than through a text-mode csv.reader
+        self.use_mmap = use_mmap
+        self.current_date = datetime.now()
+        # One parser per date column, so each detects its own format
+        self.date_parser = DateParser()
+        self.date_parsers = {SUBSCRIPTION_DATE_COLUMN: DateParser(), LAST_OPENED_COLUMN: DateParser()}
+        # May be shared between analyzers (as in batch mode) so domains are classified once
+        self.domain_index = DomainIndex(registry) if domain_index is None else domain_index
+        self.subscribers = SubscriberStore(self.domain_index)
+        self._accumulator = None
+        
+    @_profiled
+    def load_data(self):
+        """Load subscriber data from CSV file into the columnar store"""
+        self._accumulator = None
+        if self.load_cached():
+            return
+        self.subscribers.extend(self.read_rows(), self.get_domain, self.date_parsers, self.profiler, self.columns)
+        # Only complete parses are cached
+        if self.cache is not None and self.columns == ANALYSIS_COLUMNS:
+            self.cache.save(self.cache.file_hash(self.csv_file), self.subscribers)
+
+    def load_cached(self) -> bool:
+        """Replace the store with the cached parse of an unchanged CSV, if there is one"""
+        if self.cache is None:
+            return False
+        store = self.cache.load(self.cache.file_hash(self.csv_file), self.domain_index.registry)
+        if store is None:
+            return False
+        self.subscribers = store
+        self.domain_index = store.index
+        self._accumulator = None
+        return True
+
+    def read_rows(self, byte_range: Tuple[int, int] = None, fieldnames: List[str] = None):
+        """Projected rows of the CSV, or of one byte range of it (see read_projected)"""
+        return read_export(self.csv_file, self.use_mmap, fieldnames=fieldnames, byte_range=byte_range)
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE, byte_range: Tuple[int, int] = None,
+                    fieldnames: List[str] = None):
+        """Stream the CSV, or one byte range of it, as columnar stores of at most chunk_size rows"""
+        reader = self.read_rows(byte_range, fieldnames)
+        while True:
+            chunk = SubscriberStore(self.domain_index)
+            chunk.extend(islice(reader, chunk_size), self.get_domain, self.date_parsers, self.profiler, self.columns)
+            if not len(chunk):
+                return
+            yield chunk
+    
+    def parse_date(self, date_str: str) -> datetime:
+        """Parse date string to datetime object"""
+        return self.date_parser.parse(date_str)
     
-    def generate_report(self, output_file: str):
-        """Generate the complete analysis report"""
-        print("Loading data...")
-        self.load_data()
+    def get_domain(self, email: str) -> str:
+        """Extract domain from email address"""
+        if '@' in email:
+            return '@' + email.split('@')[1].lower()
+        return ''
+    
+    def is_active(self, subscriber) -> bool:
+        """Check if subscriber (a Subscriber record or CSV row dict) is active (has opened an email)"""
+        if isinstance(subscriber, Subscriber):
+            return subscriber.active
+        return bool(subscriber.get('Email last opened at', '').strip())
+    
+    def rows_processed(self) -> int:
+        """Subscribers analyzed so far, or loaded if the analysis has not run yet"""
+        if self._accumulator is not None:
+            return sum(self._accumulator.pairs.values())
+        return len(self.subscribers)
+
+    def stage(self, name: str, rows: int = 0):
+        """Context manager timing one stage when profiling, else a no-op"""
+        return self.profiler.stage(name, rows) if self.profiler else _no_stage(name, rows)
+
+    def analyze(self) -> ReportAccumulator:
+        """Walk the subscribers once, feeding the accumulators behind every analyze_* section"""
+        if self._accumulator is None:
+            with self.stage('analyze') as timing:
+                self._accumulator = self._aggregate()
+                timing['rows'] = self.rows_processed()
+        return self._accumulator
+
+    def _aggregate(self) -> ReportAccumulator:
+        if self.incremental and not len(self.subscribers):
+            state = IncrementalState.load(self.incremental, self) or IncrementalState(self)
+            self.changes = state.refresh(self)
+            state.save(self.incremental)
+            return state.accumulator
+        # Streaming and parallel runs read the CSV themselves unless a cached parse exists
+        streamed = (self.workers > 1 or self.chunk_size) and not len(self.subscribers) and not self.load_cached()
+        if streamed and self.workers > 1:
+            return self.analyze_parallel()
+        accumulator = ReportAccumulator(self)
+        if streamed:
+            # Fold each chunk in file order so the result matches the in-memory path
+            for chunk in self.iter_chunks(self.chunk_size or DEFAULT_CHUNK_SIZE):
+                accumulator.update(chunk)
+        elif self.segment:
+            with self.stage('segment_index', len(self.subscribers)):
+                index = SegmentIndex(self)
+            self.segment_rows = index.selected(index.evaluate(self.segment))
+            accumulator.update(self.subscribers.take(list(compress(range(index.size), self.segment_rows))))
+        else:
+            accumulator.update(self.subscribers)
+        return accumulator
+
+    def analyze_parallel(self) -> ReportAccumulator:
+        """Aggregate byte ranges of the CSV on a process pool, merging the partials in file order"""
+        fieldnames, ranges = split_csv(self.csv_file, self.workers)
+        task = partial(_analyze_csv_range, self.csv_file, self.years_back, self.current_date,
+                       self.chunk_size or DEFAULT_CHUNK_SIZE, fieldnames, self.use_mmap, self.domain_index.registry,
+                       self.sections)
+        accumulator = ReportAccumulator(self)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for partial_result in pool.map(task, ranges):
+                accumulator.merge(partial_result)
+        return accumulator
+
+    @_profiled
+    def analyze_basic_stats(self) -> dict:
+        """Analyze basic statistics"""
+        return self.analyze().basic_stats()
+
+    @_profiled
+    def analyze_subscription_age(self) -> dict:
+        """Analyze subscription age histogram"""
+        return self.analyze().subscription_age()
+
+    @_profiled
+    def analyze_open_rates(self) -> dict:
+        """Analyze email open rates for last 6 months"""
+        return self.analyze().open_rates()
+
+    @_profiled
+    def analyze_age_histograms(self) -> dict:
+        """Analyze subscription age with each requested bucket width"""
+        return self.analyze().age_histograms()
+
+    @_profiled
+    def analyze_open_rates_by_age(self) -> dict:
+        """Analyze average email open rates by subscription age"""
+        return self.analyze().open_rates_by_age()
+
+    @_profiled
+    def analyze_open_rates_by_age_all(self) -> dict:
+        """Analyze average email open rates by subscription age (including zero email receives)"""
+        return self.analyze().open_rates_by_age_all()
+
+    @_profiled
+    def analyze_zero_receives_by_age(self) -> dict:
+        """Analyze percentage of subscribers with 0 email receives by subscription age"""
+        return self.analyze().zero_receives_by_age()
+
+    @_profiled
+    def analyze_open_rate_distribution(self) -> dict:
+        """Analyze open rate spread and percentiles overall, by subscription age and by category"""
+        return self.analyze().open_rate_distribution()
+
+    @_profiled
+    def analyze_custom_categories(self) -> dict:
+        """Analyze the categories loaded into the domain index's registry"""
+        return self.analyze().custom_categories()
+
+    @_profiled
+    def analyze_edu_emails(self) -> dict:
+        """Analyze .edu email addresses"""
+        return self.analyze().edu_emails()
+
+    @_profiled
+    def analyze_corporation_emails(self) -> dict:
+        """Analyze major corporation emails"""
+        return self.analyze().corporation_emails()
+
+    @_profiled
+    def analyze_vc_startup_emails(self) -> dict:
+        """Analyze VC and startup emails"""
+        return self.analyze().vc_startup_emails()
+
+    @_profiled
+    def analyze_government_emails(self) -> dict:
+        """Analyze government emails"""
+        return self.analyze().government_emails()
+
+    @_profiled
+    def analyze_media_emails(self) -> dict:
+        """Analyze media organization emails"""
+        return self.analyze().media_emails()
+
+    @_profiled
+    def analyze_org_emails(self) -> dict:
+        """Analyze .org emails including philanthropy, nonprofits, and think tanks"""
+        return self.analyze().org_emails()
+    
+    def export_scores(self, output_file: str) -> int:
+        """Stream one scored row per subscriber to a CSV file (SCORE_COLUMNS), returning the rows written
+
+        The export is read a batch at a time and each batch goes through the same parsing and
+        domain classification as the analysis, into a SubscriberStore on the shared domain
+        index. Output columns are then mapped over its typed columns: category names are
+        joined once per distinct domain, open rates computed once per distinct (received,
+        opened) pair. Subscribers with zero receives have no open rate and score on recency alone.
+        With a segment, only its subscribers are written, picked out of each batch by segment_rows.
+        """
+        if self.segment:
+            self.analyze()
+        now = to_epoch_seconds(self.current_date)
+        index = self.domain_index
+        names = {**CATEGORIES, **index.registry.bits}
+        categories = []  # Domain code -> category names
+        rates = {}       # (received, opened) -> (open rate text, open rate points)
+        recency = [SCORE_RECENCY_POINTS * (1 - days / SCORE_RECENCY_DAYS) for days in range(SCORE_RECENCY_DAYS + 1)]
+        labels = [label.strip() for label in self.age_buckets.labels] + ['']  # Bucket -1 (undated) is blank
+        rows = read = 0
+        with self.stage('export_scores') as timing, open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(SCORE_COLUMNS)
+            reader = self.read_rows()
+            while True:
+                batch = list(islice(reader, EXTEND_BATCH_SIZE))
+                if not batch:
+                    break
+                if self.segment:
+                    read += len(batch)
+                    batch = list(compress(batch, self.segment_rows[read - len(batch):read]))
+                    if not batch:
+                        continue
+                chunk = SubscriberStore(index)
+                chunk.extend(batch, self.get_domain, self.date_parsers)
+                for code in range(len(categories), len(index)):
+                    categories.append('; '.join(name for name, bit in names.items() if index.masks[code] & bit))
+                for received, opened in set(zip(chunk.received, chunk.opened)).difference(rates):
+                    rates[received, opened] = ((f"{open_rate(received, opened):.1f}",
+                                                SCORE_OPEN_RATE_POINTS * opened / received) if received else ('', 0))
+
+                # Age in days, or -1 (no bucket) when undated or in the future
+                ages = (max((now - subscribed) // SECONDS_PER_DAY, -1) if dated else -1
+                        for subscribed, dated in zip(chunk.subscribed, map(gt, chunk.subscribed, repeat(UNPARSED_DATE))))
+                rate_texts, rate_points = zip(*map(rates.__getitem__, zip(chunk.received, chunk.opened)))
+                # Days since the last open, clamped to the recency table; never opened gets no points
+                days = map(min, map(max, map(floordiv, map(sub, repeat(now), chunk.last_opened), repeat(SECONDS_PER_DAY)),
+                                    repeat(0)), repeat(SCORE_RECENCY_DAYS))
+                writer.writerows(zip(next(zip(*batch)), map(index.domains.__getitem__, chunk.domain_ids),
+                                     map(categories.__getitem__, chunk.domain_ids),
+                                     map(labels.__getitem__, self.age_buckets.assign(ages)), rate_texts,
+                                     map(round, map(add, rate_points, map(recency.__getitem__, days)))))
+                rows += len(batch)
+            timing['rows'] = rows
+        return rows
+
+    def report_header(self) -> dict:
+        """Run details and the bucket labels that the report document's sections are keyed by"""
+        accumulator = self.analyze()
+        return {
+            'analysis_date': self.current_date.isoformat(timespec='seconds'),
+            'data_file': self.csv_file,
+            'segment': self.segment,
+            'subscribers': self.rows_processed(),
+            'age_buckets': self.age_buckets.labels,
+            'age_views': {months: accumulator.view_buckets(months).labels for months in self.age_views},
+            'open_rate_buckets': self.open_rate_buckets.labels,
+        }
+
+    def report_sections(self):
+        """(section, result) for each selected section in report order, each computed as it is read"""
+        for section in self.sections:
+            yield section, getattr(self, f"analyze_{section}")()
+
+    def generate_report(self, output_file: str, json_file: str = None, tables_dir: str = None):
+        """Generate the complete analysis report, optionally also as JSON and CSV tables
+
+        The report document (report_header and report_sections) is streamed to every output a
+        section at a time: the text report renders it, json_file gets it as JSON and tables_dir
+        gets its histograms and domain breakdowns as CSV tables.
+        """
+        if self._accumulator is not None:
+            pass  # Already analyzed, e.g. a batch rollup of merged results
+        elif self.incremental:
+            print(f"Diffing data against snapshot {self.incremental}...")
+        elif self.workers > 1:
+            print(f"Splitting data across {self.workers} worker processes...")
+        elif self.chunk_size:
+            print(f"Streaming data in chunks of {self.chunk_size:,} rows...")
+        else:
+            print("Loading data...")
+            self.load_data()
         
         print("Analyzing data...")
+        self.analyze()
+        if self.changes is not None:
+            print("Re-analyzed {added:,} added, {changed:,} changed and {removed:,} removed subscribers; "
+                  "{aged:,} changed age bucket".format(**self.changes))
+        header = self.report_header()
         report = []
         report.append("EMAIL SUBSCRIBER ANALYSIS REPORT")
         report.append("=" * 60)
         report.append(f"Analysis Date: {self.current_date.strftime('%Y-%m-%d %H:%M:%S')}")
         report.append(f"Data File: {self.csv_file}")
+        if self.segment:
+            report.append(f"Segment: {self.segment} ({header['subscribers']:,} subscribers)")
         report.append("")
-        
-        # Basic statistics
+        preview = list(report)
+
+        print(f"Writing report to {output_file}...")
+        with contextlib.ExitStack() as outputs:
+            f = outputs.enter_context(open(output_file, 'w', encoding='utf-8'))
+            consumers = []
+            if json_file:
+                consumers.append(JsonReportWriter(outputs.enter_context(open(json_file, 'w', encoding='utf-8'))))
+            if tables_dir:
+                consumers.append(outputs.enter_context(ReportTables(tables_dir)))
+            with self.stage('write_report'):
+                f.write('\n'.join(report))
+                for consumer in consumers:
+                    consumer.header(header)
+
+            # Only the selected sections are computed, and each is written out before the next
+            for section, result in self.report_sections():
+                report = []
+                getattr(self, f"_report_{section}")(report, result)
+                with self.stage('write_report'):
+                    if report:
+                        f.write('\n' + '\n'.join(report))
+                    for consumer in consumers:
+                        consumer.section(section, result)
+                preview.extend(report[:50 - len(preview)])
+            for consumer in consumers:
+                consumer.end()
+
+        print("Analysis complete!")
+        return '\n'.join(preview) + '\n...\n[Report continues in output file]'
+
+    # Maximum bar width in characters
+    BAR_WIDTH = 40
+
+    def _report_basic_stats(self, report: List[str], basic_stats: dict):
         print("Analyzing basic statistics...")
-        basic_stats = self.analyze_basic_stats()
         report.append("BASIC STATISTICS")
         report.append("-" * 40)
         report.append(f"Total Subscribers: {basic_stats['total_subscribers']:,}")
@@ -660,37 +2569,52 @@ class EmailAnalyzer:
         report.append(f"Average Open Rate (including zero email receives): {basic_stats['avg_open_rate_all']:.1f}%")
         report.append(f"Average Open Rate (active subscribers with emails): {basic_stats['avg_open_rate_active_with_emails']:.1f}%")
         report.append("")
-        
-        # Subscription age histogram
+
+    def _report_subscription_age(self, report: List[str], age_hist: dict):
         print("Analyzing subscription age...")
-        age_hist = self.analyze_subscription_age()
+        total = self.rows_processed()
         report.append("SUBSCRIPTION AGE HISTOGRAM (6-month increments)")
         report.append("-" * 40)
         
         # Find max value for scaling bars
         max_age_value = max(age_hist.values()) if age_hist else 1
-        bar_width = 40  # Maximum bar width in characters
         
         for bucket in sorted(age_hist.keys()):
-            start_months = bucket * 6
-            end_months = (bucket + 1) * 6
             count = age_hist[bucket]
-            percentage = (count / basic_stats['total_subscribers']) * 100
+            percentage = (count / total) * 100
             
             # Create bar
-            bar_length = int((count / max_age_value) * bar_width)
+            bar_length = int((count / max_age_value) * self.BAR_WIDTH)
             bar = '█' * bar_length
             
-            report.append(f"{start_months:3d}-{end_months:<3d} months: {count:6,} ({percentage:4.1f}%) {bar}")
+            report.append(f"{self.age_buckets.labels[bucket]}: {count:6,} ({percentage:4.1f}%) {bar}")
         report.append("")
-        
-        # Open rate histogram
+
+    def _report_age_histograms(self, report: List[str], age_histograms: dict):
+        """Subscription age at the other bucket widths, if any were asked for"""
+        if not self.age_views:
+            return
+        print("Analyzing subscription age histograms...")
+        total = self.rows_processed()
+        for months, histogram in age_histograms.items():
+            labels = self.analyze().view_buckets(months).labels
+            kind = "calendar months" if self.calendar_months else "30-day months"
+            report.append(f"SUBSCRIPTION AGE HISTOGRAM ({months}-month increments, {kind})")
+            report.append("-" * 40)
+            max_value = max(histogram.values()) if histogram else 1
+            for bucket, count in histogram.items():
+                percentage = (count / total) * 100
+                bar = '█' * int((count / max_value) * self.BAR_WIDTH)
+                report.append(f"{labels[bucket]}: {count:6,} ({percentage:4.1f}%) {bar}")
+            report.append("")
+
+    def _report_open_rates(self, report: List[str], open_rates: dict):
         print("Analyzing open rates...")
-        open_rates = self.analyze_open_rates()
         report.append("EMAIL OPEN RATE HISTOGRAM (Last 6 months)")
         report.append("-" * 40)
         
         # Separate zero receives from the regular buckets
+        open_rates = dict(open_rates)
         zero_receives = open_rates.pop('zero_receives', 0)
         
         # Find max value for scaling bars (including zero receives in comparison)
@@ -701,93 +2625,92 @@ class EmailAnalyzer:
         total_in_histogram = sum(open_rates.values()) + zero_receives
         
         for bucket in sorted(open_rates.keys(), reverse=True):
-            start_pct = bucket * 10
-            end_pct = (bucket + 1) * 10
             count = open_rates[bucket]
             percentage = (count / total_in_histogram) * 100 if total_in_histogram > 0 else 0
             
             # Create bar
-            bar_length = int((count / max_open_value) * bar_width)
+            bar_length = int((count / max_open_value) * self.BAR_WIDTH)
             bar = '█' * bar_length
             
-            report.append(f"{start_pct:2d}-{end_pct:<3d}% open rate: {count:6,} ({percentage:4.1f}%) {bar}")
+            report.append(f"{self.open_rate_buckets.labels[bucket]}: {count:6,} ({percentage:4.1f}%) {bar}")
         
         # Add zero receives line
         if zero_receives > 0:
             percentage = (zero_receives / total_in_histogram) * 100 if total_in_histogram > 0 else 0
-            bar_length = int((zero_receives / max_open_value) * bar_width)
+            bar_length = int((zero_receives / max_open_value) * self.BAR_WIDTH)
             bar = '█' * bar_length
             report.append(f"     0 email receives: {zero_receives:6,} ({percentage:4.1f}%) {bar}")
         
         report.append("")
-        
-        # Average open rate by age histogram
+
+    def _report_open_rates_by_age(self, report: List[str], age_open_rates: dict):
         print("Analyzing open rates by age...")
-        age_open_rates = self.analyze_open_rates_by_age()
         report.append("AVERAGE OPEN RATE BY SUBSCRIPTION AGE")
         report.append("-" * 40)
-        
+        self._render_age_open_rates(report, age_open_rates)
+
+    def _report_open_rates_by_age_all(self, report: List[str], age_open_rates_all: dict):
+        print("Analyzing open rates by age (including zero receives)...")
+        report.append("AVERAGE OPEN RATE BY SUBSCRIPTION AGE (including zero email receives)")
+        report.append("-" * 40)
+        self._render_age_open_rates(report, age_open_rates_all)
+
+    def _render_age_open_rates(self, report: List[str], age_open_rates: dict):
         # Find max value for scaling bars (using 100% as max since these are percentages)
         max_rate = 100
         
         for bucket in sorted(age_open_rates.keys()):
-            start_months = bucket * 6
-            end_months = (bucket + 1) * 6
             stats = age_open_rates[bucket]
             avg_rate = stats['avg_open_rate']
             count = stats['subscriber_count']
             
             # Create bar based on percentage
-            bar_length = int((avg_rate / max_rate) * bar_width)
+            bar_length = int((avg_rate / max_rate) * self.BAR_WIDTH)
             bar = '█' * bar_length
             
-            report.append(f"{start_months:3d}-{end_months:<3d} months: {avg_rate:5.1f}% avg open rate ({count:>6,} subscribers) {bar}")
+            report.append(f"{self.age_buckets.labels[bucket]}: {avg_rate:5.1f}% avg open rate ({count:>6,} subscribers) {bar}")
         report.append("")
-        
-        # Average open rate by age histogram (including zero receives)
-        print("Analyzing open rates by age (including zero receives)...")
-        age_open_rates_all = self.analyze_open_rates_by_age_all()
-        report.append("AVERAGE OPEN RATE BY SUBSCRIPTION AGE (including zero email receives)")
-        report.append("-" * 40)
-        
-        for bucket in sorted(age_open_rates_all.keys()):
-            start_months = bucket * 6
-            end_months = (bucket + 1) * 6
-            stats = age_open_rates_all[bucket]
-            avg_rate = stats['avg_open_rate']
-            count = stats['subscriber_count']
-            
-            # Create bar based on percentage
-            bar_length = int((avg_rate / max_rate) * bar_width)
-            bar = '█' * bar_length
-            
-            report.append(f"{start_months:3d}-{end_months:<3d} months: {avg_rate:5.1f}% avg open rate ({count:>6,} subscribers) {bar}")
-        report.append("")
-        
-        # Zero email receives by age histogram
+
+    def _report_zero_receives_by_age(self, report: List[str], zero_by_age: dict):
         print("Analyzing zero email receives by age...")
-        zero_by_age = self.analyze_zero_receives_by_age()
         report.append("PERCENT WITH 0 EMAIL RECEIVES BY SUBSCRIPTION AGE")
         report.append("-" * 40)
         
         for bucket in sorted(zero_by_age.keys()):
-            start_months = bucket * 6
-            end_months = (bucket + 1) * 6
             stats = zero_by_age[bucket]
             zero_percent = stats['zero_percent']
             zero_count = stats['zero_count']
             total_count = stats['total_count']
             
             # Create bar based on percentage
-            bar_length = int((zero_percent / 100) * bar_width)
+            bar_length = int((zero_percent / 100) * self.BAR_WIDTH)
             bar = '█' * bar_length
             
-            report.append(f"{start_months:3d}-{end_months:<3d} months: {zero_percent:5.1f}% have 0 receives ({zero_count:>5,}/{total_count:,}) {bar}")
+            report.append(f"{self.age_buckets.labels[bucket]}: {zero_percent:5.1f}% have 0 receives ({zero_count:>5,}/{total_count:,}) {bar}")
         report.append("")
-        
-        # .edu emails
+
+    def _report_open_rate_distribution(self, report: List[str], distribution: dict):
+        print("Analyzing open rate distribution...")
+        percentiles = ' '.join(f"{'p' + str(p):>5}" for p in OPEN_RATE_PERCENTILES)
+        report.append("OPEN RATE DISTRIBUTION (subscribers with emails received)")
+        report.append("-" * 40)
+
+        def summary_line(label, stats):
+            quantiles = ' '.join(f"{stats[f'p{p}']:4.0f}%" for p in OPEN_RATE_PERCENTILES)
+            return f"{label:<16} {stats['mean']:5.1f}% {stats['std']:5.1f}% {quantiles} ({stats['count']:>6,} subscribers)"
+
+        report.append(f"{'':<16} {'mean':>6} {'std':>6} {percentiles}")
+        report.append(summary_line('All', distribution['overall']))
+        report.append("\nBy subscription age:")
+        for bucket in sorted(distribution['by_age'].keys()):
+            report.append(summary_line(self.age_buckets.labels[bucket], distribution['by_age'][bucket]))
+        report.append("\nBy category:")
+        for category, stats in distribution['by_category'].items():
+            report.append(summary_line(category, stats))
+        report.append("")
+
+    def _report_edu_emails(self, report: List[str], edu_stats: dict):
         print("Analyzing .edu emails...")
-        edu_stats = self.analyze_edu_emails()
         report.append(".EDU EMAIL ANALYSIS")
         report.append("-" * 40)
         report.append(f"Total .edu subscribers: {edu_stats['total']:,}")
@@ -803,10 +2726,9 @@ class EmailAnalyzer:
             stats = edu_stats['prominent']['by_domain'].get(domain, {'total': 0, 'active': 0})
             report.append(f"  {domain}: {stats['total']} (active: {stats['active']})")
         report.append("")
-        
-        # Major corporations
+
+    def _report_corporation_emails(self, report: List[str], corp_stats: dict):
         print("Analyzing corporation emails...")
-        corp_stats = self.analyze_corporation_emails()
         report.append("MAJOR CORPORATION EMAIL ANALYSIS")
         report.append("-" * 40)
         report.append(f"Total Fortune 100 subscribers: {corp_stats['total']:,}")
@@ -815,10 +2737,9 @@ class EmailAnalyzer:
         for company, stats in corp_stats['top_10'].items():
             report.append(f"  {company}: {stats['total']} (active: {stats['active']})")
         report.append("")
-        
-        # VC and startups
+
+    def _report_vc_startup_emails(self, report: List[str], vc_stats: dict):
         print("Analyzing VC/startup emails...")
-        vc_stats = self.analyze_vc_startup_emails()
         report.append("VC AND STARTUP EMAIL ANALYSIS")
         report.append("-" * 40)
         report.append(f"Total VC/startup subscribers: {vc_stats['total']:,}")
@@ -828,10 +2749,9 @@ class EmailAnalyzer:
             for domain, stats in sorted(vc_stats['by_domain'].items()):
                 report.append(f"  {domain}: {stats['total']} (active: {stats['active']})")
         report.append("")
-        
-        # Government emails
+
+    def _report_government_emails(self, report: List[str], gov_stats: dict):
         print("Analyzing government emails...")
-        gov_stats = self.analyze_government_emails()
         report.append("GOVERNMENT EMAIL ANALYSIS")
         report.append("-" * 40)
         report.append(f"Total .gov subscribers: {gov_stats['total']:,}")
@@ -846,10 +2766,9 @@ class EmailAnalyzer:
             for domain, stats in sorted(gov_stats['prominent']['by_domain'].items()):
                 report.append(f"  {domain}: {stats['total']} (active: {stats['active']})")
         report.append("")
-        
-        # Media emails
+
+    def _report_media_emails(self, report: List[str], media_stats: dict):
         print("Analyzing media emails...")
-        media_stats = self.analyze_media_emails()
         report.append("MEDIA EMAIL ANALYSIS")
         report.append("-" * 40)
         report.append(f"Total media subscribers: {media_stats['total']:,}")
@@ -859,10 +2778,9 @@ class EmailAnalyzer:
             for outlet, stats in sorted(media_stats['by_outlet'].items()):
                 report.append(f"  {outlet}: {stats['total']} (active: {stats['active']})")
         report.append("")
-        
-        # Philanthropy/nonprofit/think tank emails
+
+    def _report_org_emails(self, report: List[str], org_stats: dict):
         print("Analyzing philanthropy/nonprofit emails...")
-        org_stats = self.analyze_org_emails()
         report.append("PHILANTHROPY, NONPROFIT, AND THINK TANK ANALYSIS")
         report.append("-" * 40)
         report.append(f"Total from all tracked philanthropy orgs: {org_stats['all_philanthropy']['total']:,}")
@@ -875,27 +2793,1111 @@ class EmailAnalyzer:
             for org, stats in sorted(org_stats['major_orgs'].items()):
                 report.append(f"  {org}: {stats['total']} (active: {stats['active']})")
         report.append("")
-        
-        # Write report to file
-        print(f"Writing report to {output_file}...")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(report))
-        
-        print("Analysis complete!")
-        return '\n'.join(report[:50]) + '\n...\n[Report continues in output file]'
+
+    def _report_custom_categories(self, report: List[str], custom_categories: dict):
+        """Categories loaded from --categories files, if any"""
+        if not self.domain_index.registry:
+            return
+        print("Analyzing custom categories...")
+        report.append("CUSTOM CATEGORY ANALYSIS")
+        report.append("-" * 40)
+        for category, stats in custom_categories.items():
+            report.append(f"{category}: {stats['total']:,} subscribers (active: {stats['active']:,})")
+            for label, label_stats in stats['top_10'].items():
+                report.append(f"  {label}: {label_stats['total']} (active: {label_stats['active']})")
+        report.append("")
+
+
+def _analyze_csv_range(csv_file: str, years_back: int, current_date: datetime, chunk_size: int,
+                       fieldnames: List[str], use_mmap: bool, registry: CategoryRegistry, sections: Tuple[str, ...],
+                       byte_range: Tuple[int, int]) -> ReportAccumulator:
+    """Process pool task: aggregate one byte range of the CSV into a partial ReportAccumulator"""
+    analyzer = EmailAnalyzer(csv_file, years_back, use_mmap=use_mmap, registry=registry, sections=sections)
+    analyzer.current_date = current_date
+    accumulator = ReportAccumulator(analyzer)
+    for chunk in analyzer.iter_chunks(chunk_size, byte_range, fieldnames):
+        accumulator.update(chunk)
+    return accumulator
+
+
+# Registers of the HyperLogLog sketches kept with each publication's hashes: 2**precision
+DEFAULT_HLL_PRECISION = 14
+
+
+def email_hash(email: str) -> int:
+    """64-bit hash of a normalized email address, stable across runs and machines"""
+    return int.from_bytes(hashlib.blake2b(email.strip().lower().encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class HyperLogLog:
+    """Cardinality sketch over 64-bit hashes; unions merge exactly, intersections are estimated"""
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION, registers: bytes = None):
+        self.precision = precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(1 << precision)
+
+    def add(self, hashes):
+        registers = self.registers
+        shift = 64 - self.precision
+        low = (1 << shift) - 1
+        for value in hashes:
+            rank = shift - (value & low).bit_length() + 1
+            index = value >> shift
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def union(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        return HyperLogLog(self.precision, bytes(map(max, self.registers, other.registers)))
+
+    def count(self) -> float:
+        """Estimated number of distinct hashes added"""
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(map(_HLL_WEIGHTS.__getitem__, self.registers))
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # Linear counting for small sets
+        return estimate
+
+
+_HLL_WEIGHTS = [2.0 ** -rank for rank in range(65)]
+
+
+class PublicationHashes:
+    """One publication's subscribers as sorted 64-bit email hashes, with each one's category bits"""
+
+    MAGIC = b'ESAOVLAP'
+    VERSION = 1
+
+    def __init__(self, name: str, hashes: array, masks: array, sketch: HyperLogLog):
+        self.name = name
+        self.hashes = hashes  # array('Q'), sorted and unique
+        self.masks = masks    # array('H'), category bits of the subscriber at the same position
+        self.sketch = sketch
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    @classmethod
+    def from_export(cls, name: str, csv_file: str, index: DomainIndex = None,
+                    precision: int = DEFAULT_HLL_PRECISION, use_mmap: bool = True) -> 'PublicationHashes':
+        """Hash every Email of an export (read as EmailAnalyzer.read_rows would), keeping the categories of its domain"""
+        index = DomainIndex() if index is None else index
+        masks_by_hash = {}
+        for (email, *_) in read_export(csv_file, use_mmap, columns=(EMAIL_COLUMN,)):
+            if email:
+                domain = '@' + email.split('@')[1].lower() if '@' in email else ''
+                masks_by_hash[email_hash(email)] = index.masks[index.intern(domain)] & BUILTIN_CATEGORIES
+        hashes = array('Q', sorted(masks_by_hash))
+        sketch = HyperLogLog(precision)
+        sketch.add(hashes)
+        return cls(name, hashes, array('H', map(masks_by_hash.__getitem__, hashes)), sketch)
+
+    def save(self, path: str):
+        header = json.dumps({'version': self.VERSION, 'name': self.name, 'count': len(self.hashes),
+                             'byteorder': sys.byteorder, 'precision': self.sketch.precision}).encode('utf-8')
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(self.MAGIC + len(header).to_bytes(4, 'little') + header)
+            self.hashes.tofile(f)
+            self.masks.tofile(f)
+            f.write(self.sketch.registers)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'PublicationHashes':
+        with open(path, 'rb') as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"{path} is not an overlap index file")
+            header = json.loads(f.read(int.from_bytes(f.read(4), 'little')))
+            if header['version'] != cls.VERSION:
+                raise ValueError(f"{path} was written by an incompatible version")
+            hashes, masks = array('Q'), array('H')
+            hashes.fromfile(f, header['count'])
+            masks.fromfile(f, header['count'])
+            if header['byteorder'] != sys.byteorder:
+                hashes.byteswap()
+                masks.byteswap()
+            sketch = HyperLogLog(header['precision'], f.read(1 << header['precision']))
+        return cls(header['name'], hashes, masks, sketch)
+
+
+# Above this many haystack entries per needle, sorted_lookup binary searches instead of merging
+LOOKUP_SEARCH_RATIO = 32
+
+
+def sorted_lookup(haystack: array, needles: array) -> Tuple[array, bytes]:
+    """Where each needle sits in the sorted haystack, and 1 if it is there, else 0 (needles sorted too)
+
+    Lists of similar size are merged in one linear walk over both. When the haystack is far
+    larger, each needle is instead binary searched from C (bisect_left mapped over them), in
+    O(len(needles) * log(len(haystack))). Neither builds a set of the hashes.
+    """
+    if not len(haystack):
+        return array('q', bytes(8 * len(needles))), bytes(len(needles))
+    if len(haystack) > LOOKUP_SEARCH_RATIO * len(needles):
+        positions = array('q', map(bisect_left, repeat(haystack), needles))
+        found = bytes(map(eq, map(haystack.__getitem__, map(min, positions, repeat(len(haystack) - 1))), needles))
+        return positions, found
+
+    positions = array('q', bytes(8 * len(needles)))
+    found = bytearray(len(needles))
+    values = iter(haystack)
+    position, value = 0, next(values)
+    for i, needle in enumerate(needles):
+        while value is not None and value < needle:
+            position += 1
+            value = next(values, None)
+        positions[i] = position
+        if value == needle:
+            found[i] = 1
+    return positions, bytes(found)
+
+
+class OverlapIndex:
+    """Directory of publications' hashed subscriber lists, answering overlap queries
+
+    Exact queries intersect the sorted hash arrays by binary search (see sorted_lookup),
+    starting from the smallest list, and break the shared subscribers down by category. Estimated queries use only the
+    HyperLogLog sketches (inclusion-exclusion over unions), so they cost the same for
+    any list size, at a few percent error and without categories.
+    """
+
+    SUFFIX = '.overlap'
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._loaded = {}
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name + self.SUFFIX)
+
+    def add(self, publication: PublicationHashes):
+        os.makedirs(self.directory, exist_ok=True)
+        publication.save(self.path(publication.name))
+        self._loaded[publication.name] = publication
+
+    def names(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len(self.SUFFIX)] for name in os.listdir(self.directory) if name.endswith(self.SUFFIX))
+
+    def get(self, name: str) -> PublicationHashes:
+        if name not in self._loaded:
+            self._loaded[name] = PublicationHashes.load(self.path(name))
+        return self._loaded[name]
+
+    def shared(self, names: List[str]) -> array:
+        """Sorted hashes of subscribers on every one of the named publications"""
+        publications = sorted(map(self.get, names), key=len)
+        common = publications[0].hashes
+        for publication in publications[1:]:
+            common = array('Q', compress(common, sorted_lookup(publication.hashes, common)[1]))
+        return common
+
+    def categories(self, name: str, hashes: array) -> Dict[str, int]:
+        """Category breakdown of the given subscribers (sorted hashes) of a publication"""
+        publication = self.get(name)
+        positions, found = sorted_lookup(publication.hashes, hashes)
+        return self.category_counts(Counter(map(publication.masks.__getitem__, compress(positions, found))))
+
+    def category_counts(self, masks: Counter) -> Dict[str, int]:
+        """Subscribers per category from a {category bits: subscribers} tally"""
+        return {category: sum(count for mask, count in masks.items() if mask & bit)
+                for category, bit in CATEGORIES.items()}
+
+    def overlap(self, names: List[str]) -> dict:
+        """Exact N-way overlap: subscribers on all the named publications, by category"""
+        common = self.shared(names)
+        return {'subscribers': len(common), 'categories': self.categories(names[0], common)}
+
+    def also_subscribed(self, name: str, others: List[str]) -> dict:
+        """How many of a publication's subscribers are on at least one of the others, by category"""
+        publication = self.get(name)
+        elsewhere = bytes(len(publication))
+        for other in others:
+            elsewhere = bytes(map(or_, elsewhere, sorted_lookup(self.get(other).hashes, publication.hashes)[1]))
+        masks = Counter(compress(publication.masks, elsewhere))
+        return {'subscribers': sum(masks.values()), 'categories': self.category_counts(masks)}
+
+    def estimate_overlap(self, names: List[str]) -> float:
+        """Estimated N-way overlap from the sketches, by inclusion-exclusion over unions"""
+        sketches = [self.get(name).sketch for name in names]
+        estimate = 0.0
+        for size in range(1, len(sketches) + 1):
+            for group in combinations(sketches, size):
+                union = group[0]
+                for sketch in group[1:]:
+                    union = union.union(sketch)
+                estimate += (-1) ** (size + 1) * union.count()
+        return max(estimate, 0.0)
+
+    def report(self, names: List[str], estimate: bool = False) -> List[str]:
+        """Overlap report lines for the named publications"""
+        lines = ["SUBSCRIBER OVERLAP" + (" (HyperLogLog estimates)" if estimate else ""), "-" * 40]
+        for name in names:
+            lines.append(f"{name}: {len(self.get(name)):,} subscribers")
+        lines.append("")
+        lines.append("Pairwise overlap:")
+        for first, second in combinations(names, 2):
+            if estimate:
+                lines.append(f"  {first} & {second}: ~{self.estimate_overlap([first, second]):,.0f}")
+            else:
+                lines.append(f"  {first} & {second}: {len(self.shared([first, second])):,}")
+        if not estimate:
+            lines.append("")
+            for name in names:
+                others = [other for other in names if other != name]
+                also = self.also_subscribed(name, others)
+                share = also['subscribers'] / len(self.get(name)) if len(self.get(name)) else 0
+                lines.append(f"{name} subscribers also on another listed publication: "
+                             f"{also['subscribers']:,} ({share:.1%})")
+                lines.extend(f"  {category}: {count:,}" for category, count in also['categories'].items())
+        if len(names) > 2:
+            lines.append("")
+            if estimate:
+                lines.append(f"On all {len(names)} publications: ~{self.estimate_overlap(names):,.0f}")
+            else:
+                overlap = self.overlap(names)
+                lines.append(f"On all {len(names)} publications: {overlap['subscribers']:,}")
+                lines.extend(f"  {category}: {count:,}" for category, count in overlap['categories'].items())
+        return lines
+
+
+def section_metrics(accumulator: ReportAccumulator, sections=SECTION_COLUMNS) -> Dict[str, float]:
+    """Every numeric output of the given report sections, keyed by dotted path (section.key.subkey)"""
+    metrics = {}
+
+    def flatten(prefix, value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                flatten(f"{prefix}.{key}", item)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[prefix] = value
+
+    for section in sections:
+        flatten(section, getattr(accumulator, section)())
+    return metrics
+
+
+class HistoryStore:
+    """SQLite store of report metrics per publication and run date, for trend queries
+
+    One row per (publication, metric, run date), clustered by that key so a metric's series
+    for a publication is a single range scan. Recording a run again on the same date
+    replaces its values.
+    """
+
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS metrics ("
+            " publication TEXT NOT NULL, metric TEXT NOT NULL, run_date TEXT NOT NULL, value REAL NOT NULL,"
+            " PRIMARY KEY (publication, metric, run_date)) WITHOUT ROWID")
+
+    def close(self):
+        self.connection.close()
+
+    def record(self, publication: str, run_date: datetime, metrics: Dict[str, float]):
+        """Store one run's metrics"""
+        day = run_date.strftime('%Y-%m-%d')
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO metrics (publication, metric, run_date, value) VALUES (?, ?, ?, ?)",
+                ((publication, metric, day, value) for metric, value in metrics.items()))
+
+    def publications(self) -> List[str]:
+        return [row[0] for row in self.connection.execute("SELECT DISTINCT publication FROM metrics ORDER BY 1")]
+
+    def metrics(self, pattern: str = '*') -> List[str]:
+        """Metric names matching a glob pattern such as basic_stats.*"""
+        return [row[0] for row in self.connection.execute(
+            "SELECT DISTINCT metric FROM metrics WHERE metric GLOB ? ORDER BY 1", (pattern,))]
+
+    def series(self, metric: str, publication: str = None, since: str = None,
+               until: str = None) -> List[Tuple[str, str, float]]:
+        """(publication, run date, value) for a metric, by publication and date, optionally within dates"""
+        query = "SELECT publication, run_date, value FROM metrics WHERE metric = ?"
+        params = [metric]
+        for condition, value in (("publication = ?", publication), ("run_date >= ?", since),
+                                 ("run_date <= ?", until)):
+            if value is not None:
+                query += " AND " + condition
+                params.append(value)
+        return list(self.connection.execute(query + " ORDER BY publication, run_date", params))
+
+
+# Category index shared by the batch jobs run in one worker process
+_batch_index = None
+
+
+def _init_batch_worker(registry: CategoryRegistry = None):
+    global _batch_index
+    _batch_index = DomainIndex(registry)
+
+
+def find_exports(path: str) -> List[str]:
+    """Exports named by a batch argument: every .csv in a directory, or the paths listed in a manifest
+
+    Manifest lines are export paths, relative to the manifest's directory; blank lines and
+    lines starting with # are skipped.
+    """
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith('.csv'))
+    base = os.path.dirname(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    return [os.path.join(base, line) for line in lines if line and not line.startswith('#')]
+
+
+def publication_names(exports: List[str]) -> List[str]:
+    """Report names for exports: the file name without .csv, numbered when two collide"""
+    names, seen = [], Counter()
+    for export in exports:
+        name = os.path.splitext(os.path.basename(export))[0]
+        seen[name] += 1
+        names.append(name if seen[name] == 1 else f"{name}-{seen[name]}")
+    return names
+
+
+def _batch_job(csv_file: str, report_file: str, name: str, years_back: int, current_date: datetime, chunk_size: int,
+               cache_size: int, overlap_dir: str, analyzer_options: dict) -> Tuple[ReportAccumulator, str]:
+    """Batch task: write one publication's report and return its accumulator, or the error
+
+    analyzer_options are the report settings (such as sections) passed on to EmailAnalyzer.
+    """
+    global _batch_index
+    if _batch_index is None:
+        _batch_index = DomainIndex()
+    cache = None if cache_size is None else ExportCache.beside(csv_file, cache_size)
+    analyzer = EmailAnalyzer(csv_file, years_back, chunk_size=chunk_size, cache=cache, domain_index=_batch_index,
+                             **analyzer_options)
+    analyzer.current_date = current_date
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer.generate_report(report_file)
+        if overlap_dir is not None:
+            OverlapIndex(overlap_dir).add(PublicationHashes.from_export(name, csv_file, _batch_index,
+                                                                        use_mmap=analyzer.use_mmap))
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    return analyzer.analyze(), None
+
+
+def analyze_batch(exports: List[str], report_dir: str, years_back: int = 6, jobs: int = 1, chunk_size: int = 0,
+                  cache_size: int = None, overlap_dir: str = None, history: HistoryStore = None,
+                  registry: CategoryRegistry = None, sections: Tuple[str, ...] = None, age_views: Tuple[int, ...] = (),
+                  calendar_months: bool = False, open_rate_buckets: Buckets = None,
+                  use_mmap: bool = True) -> Dict[str, ReportAccumulator]:
+    """Analyze many exports on a pool of jobs processes, writing one report each plus a rollup
+
+    Each worker process keeps one DomainIndex across its jobs, so a domain seen in several
+    exports is classified once per worker. The rollup merges every publication's results
+    into a report on the combined audience, followed by category totals per publication.
+    With overlap_dir, each publication's hashed subscriber list is also added to that
+    OverlapIndex, and with a history store every publication's metrics are recorded.
+    Every report, the rollup included, covers only the given sections if any are given and
+    uses the given histogram settings (see EmailAnalyzer). use_mmap picks the CSV reader, as in EmailAnalyzer.
+    """
+    os.makedirs(report_dir, exist_ok=True)
+    analyzer_options = {'sections': sections, 'age_views': age_views, 'calendar_months': calendar_months,
+                        'open_rate_buckets': open_rate_buckets, 'use_mmap': use_mmap}
+    current_date = datetime.now()
+    names = publication_names(exports)
+    reports = [os.path.join(report_dir, f"{name}_report.txt") for name in names]
+    task = partial(_batch_job, years_back=years_back, current_date=current_date, chunk_size=chunk_size,
+                   cache_size=cache_size, overlap_dir=overlap_dir, analyzer_options=analyzer_options)
+    if jobs > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker, initargs=(registry,))
+        outcomes = pool.map(task, exports, reports, names)
+    else:
+        _init_batch_worker(registry)
+        pool, outcomes = None, map(task, exports, reports, names)
+
+    index = DomainIndex(registry)  # Categories for the sections computed here, from the returned accumulators
+    rollup = EmailAnalyzer(f"{len(exports)} publications", years_back, domain_index=index, **analyzer_options)
+    rollup_sections = rollup.sections
+    results = {}
+    try:
+        for name, export, report, (accumulator, error) in zip(names, exports, reports, outcomes):
+            if error is None:
+                accumulator.index = index
+                results[name] = accumulator
+                if history is not None:
+                    history.record(name, current_date, section_metrics(accumulator, rollup_sections))
+                print(f"{name}: {sum(accumulator.pairs.values()):,} subscribers, report saved to {report}")
+            else:
+                print(f"{name}: error analyzing {export}: {error}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    rollup.csv_file = f"{len(results)} publications: {', '.join(results)}"
+    rollup.current_date = current_date
+    rollup._accumulator = combined = ReportAccumulator(rollup)
+    for accumulator in results.values():
+        combined.merge(accumulator)
+    rollup_file = os.path.join(report_dir, 'rollup_report.txt')
+    with contextlib.redirect_stdout(io.StringIO()):
+        rollup.generate_report(rollup_file)
+    if EMAIL_COLUMN in rollup.columns:  # Category totals need the domains, which other sections skip
+        with open(rollup_file, 'a', encoding='utf-8') as f:
+            f.write('\n' + '\n'.join(publication_table(results)) + '\n')
+    print(f"Rollup of {len(results)} publications saved to {rollup_file}")
+    return results
+
+
+def publication_table(results: Dict[str, ReportAccumulator]) -> List[str]:
+    """Domain category totals (active in parentheses) for each publication of a batch"""
+    lines = ["CATEGORY TOTALS BY PUBLICATION", "-" * 40]
+    header = f"{'Publication':30} {'Subscribers':>11} {'.edu':>13} {'Fortune 100':>13} {'VC/startup':>13} " \
+             f"{'.gov':>13} {'Media':>13} {'Philanthropy':>13}"
+    lines.append(header)
+    for name, accumulator in results.items():
+        cells = [accumulator.edu_emails(), accumulator.corporation_emails(), accumulator.vc_startup_emails(),
+                 accumulator.government_emails(), accumulator.media_emails(),
+                 accumulator.org_emails()['all_philanthropy']]
+        lines.append(f"{name[:30]:30} {sum(accumulator.pairs.values()):>11,} " +
+                     ' '.join(f"{stats['total']:>6,} ({stats['active']:>4,})" for stats in cells))
+    return lines
+
+
+# Segment filter tokens: parentheses, comparison operators, quoted values and bare words
+_SEGMENT_TOKEN = re.compile(r'\s*(?:([()])|(<=|>=|!=|<|>|=)|"([^"]*)"|\'([^\']*)\'|([^\s()<>=!\'"]+))')
+SEGMENT_FLAGS = ('active', 'zero_receives')
+# Fields compared in segment filters, with their operators; buckets are half-open so age and open_rate split with < and >=
+SEGMENT_FIELDS = {'category': ('=', '!='), 'age': ('<', '>='), 'open_rate': ('<', '>=')}
+
+# bytes.translate tables between 0/1 flag bytes and the binary digits of a bitmap
+_FLAG_DIGITS = b'0' + b'1' * 255
+_DIGIT_FLAGS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def parse_segment(text: str) -> tuple:
+    """Parse a segment filter such as: category = "Fortune 100" and age < 12 and open_rate < 20
+
+    Terms are the flags active and zero_receives, category = NAME (or !=, quoting names with
+    spaces), and age in 30-day months or open_rate in percent, split with < or >=. Terms
+    combine with and, or, not and parentheses. Returns the expression tree; raises ValueError
+    on a malformed filter.
+    """
+    tokens = []
+    pos, end = 0, len(text.rstrip())
+    while pos < end:
+        match = _SEGMENT_TOKEN.match(text, pos)
+        if match is None:
+            raise ValueError(f"unexpected {text[pos:].strip()!r} in segment filter")
+        paren, operator, double, single, word = match.groups()
+        if paren or operator:
+            tokens.append(('symbol', paren or operator))
+        elif word is None:
+            tokens.append(('value', single if double is None else double))
+        else:
+            tokens.append(('word', word))
+        pos = match.end()
+    tokens.append(('end', 'the end'))
+    index = 0
+
+    def take() -> tuple:
+        nonlocal index
+        index += 1
+        return tokens[index - 1]
+
+    def keyword(word: str) -> bool:
+        nonlocal index
+        kind, value = tokens[index]
+        if kind == 'word' and value.lower() == word:
+            index += 1
+            return True
+        return False
+
+    def expression() -> tuple:
+        node = conjunction()
+        while keyword('or'):
+            node = ('or', node, conjunction())
+        return node
+
+    def conjunction() -> tuple:
+        node = term()
+        while keyword('and'):
+            node = ('and', node, term())
+        return node
+
+    def term() -> tuple:
+        if keyword('not'):
+            return ('not', term())
+        kind, value = take()
+        if (kind, value) == ('symbol', '('):
+            node = expression()
+            if take() != ('symbol', ')'):
+                raise ValueError(f"missing ')' in segment filter {text!r}")
+            return node
+        if kind == 'word' and value in SEGMENT_FLAGS:
+            return ('flag', value)
+        if kind != 'word' or value not in SEGMENT_FIELDS:
+            raise ValueError(f"expected {', '.join(SEGMENT_FLAGS + tuple(SEGMENT_FIELDS))} or '(', found {value!r}")
+        field, operators = value, SEGMENT_FIELDS[value]
+        kind, operator = take()
+        if operator not in operators:
+            raise ValueError(f"{field} compares with {' or '.join(operators)}, not {operator!r}")
+        kind, operand = take()
+        if kind not in ('word', 'value'):
+            raise ValueError(f"expected a value after {field} {operator}, found {operand!r}")
+        if field != 'category':
+            try:
+                operand = float(operand.rstrip('%'))
+            except ValueError:
+                raise ValueError(f"{field} compares with a number, not {operand!r}") from None
+        return ('compare', field, operator, operand)
+
+    node = expression()
+    if tokens[index][0] != 'end':
+        raise ValueError(f"unexpected {tokens[index][1]!r} in segment filter")
+    return node
+
+
+def segment_age_months(years_back: int) -> List[int]:
+    """Months at which a segment filter can split age: the edges of the SegmentIndex age bitmaps"""
+    return [edge // 30 for edge in Buckets.linear(30, years_back * 12 + 1).edges]
+
+
+def check_segment_split(field: str, value: float, edges: List[float]):
+    """Raise ValueError unless an age or open_rate comparison splits at one of its bitmap edges"""
+    if value in edges:
+        return
+    if field == 'age':
+        raise ValueError(f"age is indexed by month, so it splits at whole months from 0 to {edges[-1]}")
+    raise ValueError(f"open_rate is indexed by histogram bucket, so it splits at "
+                     f"{', '.join(f'{edge:g}' for edge in edges)}")
+
+
+def check_segment(node: tuple, years_back: int, open_rate_edges: List[float], categories: Dict[str, int]):
+    """Check a parse_segment tree against the bitmaps SegmentIndex will build, before loading the export
+
+    Raises ValueError for an unknown category or an age or open_rate value that falls
+    between bitmap edges, with the message SegmentIndex.evaluate would give.
+    """
+    kind = node[0]
+    if kind in ('or', 'and'):
+        check_segment(node[1], years_back, open_rate_edges, categories)
+        check_segment(node[2], years_back, open_rate_edges, categories)
+    elif kind == 'not':
+        check_segment(node[1], years_back, open_rate_edges, categories)
+    elif kind == 'compare':
+        _, field, _, value = node
+        if field == 'category':
+            if value not in categories:
+                raise ValueError(f"unknown category {value!r} (choose from {', '.join(categories)})")
+        else:
+            check_segment_split(field, value, segment_age_months(years_back) if field == 'age' else open_rate_edges)
+
+
+def _bitmap(flags: bytes) -> int:
+    """Bitmap with bit i set where flags[i] is nonzero"""
+    return int(flags.translate(_FLAG_DIGITS)[::-1] or b'0', 2)
+
+
+def _bucket_bitmaps(codes, count: int) -> List[int]:
+    """One bitmap per bucket from each row's bucket index, where count means no bucket"""
+    if count < 256:
+        codes = bytes(codes)
+        return [int(codes.translate(bytes(49 if code == bucket else 48 for code in range(256)))[::-1] or b'0', 2)
+                for bucket in range(count)]
+    codes = array('L', codes)
+    return [_bitmap(bytes(map(eq, codes, repeat(bucket)))) for bucket in range(count)]
+
+
+class SegmentIndex:
+    """Bitmap indexes over a loaded export, answering segment filters (see parse_segment)
+
+    Each bitmap is an int with bit i set for the subscriber in row i: one per domain category,
+    per subscription age month (30 days, up to years_back years), per open rate bucket, and
+    for the active and zero receives flags. They are built once from the columnar store, so
+    a filter costs a few big-int and/or/not operations, and its rows can then feed a
+    ReportAccumulator for any report section over just that segment.
+
+    Subscribers without a subscription date are in no age bitmap, and those with zero
+    receives in no open rate bitmap, so 'age < 12' leaves them out and 'not age < 12' keeps them.
+    """
+
+    def __init__(self, analyzer: 'EmailAnalyzer'):
+        self.analyzer = analyzer
+        self.store = store = analyzer.subscribers
+        self.size = len(store)
+        self.all = (1 << self.size) - 1
+        self.flags = {'active': _bitmap(store.active_flags()), 'zero_receives': _bitmap(bytes(map(not_, store.received)))}
+
+        masks = store.index.masks
+        self.categories = {}
+        for name, bit in {**CATEGORIES, **store.index.registry.bits}.items():
+            in_category = bytes(bool(mask & bit) for mask in masks)
+            self.categories[name] = _bitmap(bytes(map(in_category.__getitem__, store.domain_ids)))
+
+        # Age in days, or -1 (no bucket) when undated or in the future
+        now = to_epoch_seconds(analyzer.current_date)
+        self.age_buckets = Buckets.linear(30, analyzer.years_back * 12 + 1)
+        count = len(self.age_buckets)
+        ages = (max((now - subscribed) // SECONDS_PER_DAY, -1) if dated else -1
+                for subscribed, dated in zip(store.subscribed, map(gt, store.subscribed, repeat(UNPARSED_DATE))))
+        self.ages = _bucket_bitmaps(map(mod, self.age_buckets.assign(ages), repeat(count + 1)), count)
+
+        # Open rates only take a few distinct values, so they are bucketed once per (received, opened) pair
+        self.open_rate_buckets = analyzer.open_rate_buckets
+        count = len(self.open_rate_buckets)
+        rated = [pair for pair in dict.fromkeys(zip(store.received, store.opened)) if pair[0] > 0]
+        bucket_of = defaultdict(lambda: count)
+        bucket_of.update((pair, bucket if bucket >= 0 else count) for pair, bucket in
+                         zip(rated, self.open_rate_buckets.assign(open_rate(*pair) for pair in rated)))
+        self.open_rates = _bucket_bitmaps(map(bucket_of.__getitem__, zip(store.received, store.opened)), count)
+
+    def evaluate(self, segment) -> int:
+        """Bitmap of the subscribers matching a segment filter (its text or parse_segment tree)"""
+        node = parse_segment(segment) if isinstance(segment, str) else segment
+        kind = node[0]
+        if kind == 'or':
+            return self.evaluate(node[1]) | self.evaluate(node[2])
+        if kind == 'and':
+            return self.evaluate(node[1]) & self.evaluate(node[2])
+        if kind == 'not':
+            return self.all & ~self.evaluate(node[1])
+        if kind == 'flag':
+            return self.flags[node[1]]
+
+        _, field, operator, value = node
+        if field == 'category':
+            if value not in self.categories:
+                raise ValueError(f"unknown category {value!r} (choose from {', '.join(self.categories)})")
+            return self.categories[value] if operator == '=' else self.all & ~self.categories[value]
+        if field == 'age':
+            bitmaps, edges = self.ages, segment_age_months(self.analyzer.years_back)
+        else:
+            bitmaps, edges = self.open_rates, self.open_rate_buckets.edges
+        check_segment_split(field, value, edges)
+        split = edges.index(value)
+        return reduce(or_, bitmaps[:split] if operator == '<' else bitmaps[split:], 0)
+
+    def count(self, bitmap: int) -> int:
+        """Subscribers in a bitmap"""
+        return bin(bitmap).count('1')
+
+    def selected(self, bitmap: int) -> bytes:
+        """1 for each row in the bitmap, else 0"""
+        return format(bitmap, f"0{self.size}b")[::-1].encode().translate(_DIGIT_FLAGS) if self.size else b''
+
+    def rows(self, bitmap: int) -> List[int]:
+        """Rows in a bitmap, in store order"""
+        return list(compress(range(self.size), self.selected(bitmap)))
+
+    def accumulator(self, segment) -> ReportAccumulator:
+        """Accumulators over just the subscribers matching a segment filter, for any report section"""
+        accumulator = ReportAccumulator(self.analyzer)
+        accumulator.update(self.store.take(self.rows(self.evaluate(segment))))
+        return accumulator
+
+
+# Cached query results kept per loaded dataset before the oldest are dropped
+SERVICE_CACHE_SIZE = 1024
+
+
+class AnalysisService:
+    """A parsed export kept in memory, answering report sections over filtered segments
+
+    Filters select subscribers by domain category, subscription age in (30-day) months and
+    whether they have opened an email, or by a segment filter over the SegmentIndex (built
+    on first use). Results are cached per query for as long as the
+    export file is unchanged. A changed file, or reload(), parses the export into a new
+    dataset on a background thread while queries keep being answered from the current one,
+    then swaps it in; only the swap itself holds reload_lock.
+    """
+
+    FILTERS = ('category', 'min_months', 'max_months', 'active', 'where')
+
+    def __init__(self, csv_file: str, **analyzer_options):
+        self.csv_file = csv_file
+        self.analyzer_options = analyzer_options
+        self.reload_lock = threading.Lock()
+        self.state = self._load()
+        self.reloading = None     # Background thread parsing the next dataset, if any
+        self.reload_error = None  # Why the last reload failed, if it did
+        self.failed_stamp = None  # File stamp of that failed reload, not retried until the file changes again
+
+    def _stamp(self) -> Tuple[int, int]:
+        stat = os.stat(self.csv_file)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self) -> dict:
+        stamp = self._stamp()
+        analyzer = EmailAnalyzer(self.csv_file, **self.analyzer_options)
+        analyzer.load_data()
+        return {'analyzer': analyzer, 'stamp': stamp, 'loaded_at': datetime.now(), 'index': None, 'segments': {},
+                'results': {}}
+
+    def reload(self) -> threading.Thread:
+        """Start parsing the export again on a background thread, unless that is already under way"""
+        with self.reload_lock:
+            if self.reloading is None or not self.reloading.is_alive():
+                self.reloading = threading.Thread(target=self._reload, name='reload', daemon=True)
+                self.reloading.start()
+            return self.reloading
+
+    def _reload(self):
+        """Parse the export without holding the lock, then swap the new dataset in"""
+        stamp = None
+        try:
+            stamp = self._stamp()
+            state = self._load()
+        except Exception as e:
+            with self.reload_lock:
+                self.reload_error = f"{type(e).__name__}: {e}"
+                self.failed_stamp = stamp
+            return
+        with self.reload_lock:
+            self.state = state
+            self.reload_error = self.failed_stamp = None
+
+    def current(self) -> dict:
+        """The dataset to answer from, starting a background reload if the export file changed"""
+        state = self.state
+        try:
+            stamp = self._stamp()
+        except OSError:
+            stamp = state['stamp']  # Keep serving the loaded data while the file is being replaced
+        if stamp != state['stamp'] and stamp != self.failed_stamp:
+            self.reload()
+        return state
+
+    def info(self) -> dict:
+        state = self.current()
+        analyzer = state['analyzer']
+        return {'csv_file': self.csv_file, 'subscribers': len(analyzer.subscribers),
+                'loaded_at': state['loaded_at'].isoformat(timespec='seconds'),
+                'reloading': self.reloading is not None and self.reloading.is_alive(),
+                'reload_error': self.reload_error, 'sections': list(SECTION_COLUMNS), 'filters': list(self.FILTERS),
+                'categories': list(CATEGORIES) + analyzer.domain_index.registry.names}
+
+    def parse_filters(self, params: Dict[str, str], analyzer: 'EmailAnalyzer') -> tuple:
+        """Normalized (name, value) filter pairs from query parameters; raises ValueError on bad ones"""
+        unknown = set(params) - set(self.FILTERS)
+        if unknown:
+            raise ValueError(f"unknown filter {', '.join(sorted(unknown))} (expected {', '.join(self.FILTERS)})")
+        filters = {}
+        if 'category' in params:
+            categories = {**CATEGORIES, **analyzer.domain_index.registry.bits}
+            if params['category'] not in categories:
+                raise ValueError(f"unknown category {params['category']!r}")
+            filters['category'] = params['category']
+        for name in ('min_months', 'max_months'):
+            if name in params:
+                try:
+                    filters[name] = float(params[name])
+                except ValueError:
+                    raise ValueError(f"{name} must be a number of months, not {params[name]!r}") from None
+        if 'active' in params:
+            if params['active'].lower() not in ('1', '0', 'true', 'false', 'yes', 'no'):
+                raise ValueError(f"active must be true or false, not {params['active']!r}")
+            filters['active'] = params['active'].lower() in ('1', 'true', 'yes')
+        if 'where' in params:
+            parse_segment(params['where'])
+            filters['where'] = params['where']
+        return tuple(sorted(filters.items()))
+
+    def segment(self, state: dict, filters: tuple) -> ReportAccumulator:
+        """Accumulators over the subscribers matching the filters, cached per dataset"""
+        accumulator = state['segments'].get(filters)
+        if accumulator is not None:
+            return accumulator
+        analyzer = state['analyzer']
+        store = analyzer.subscribers
+        selected = bytes([1]) * len(store)
+        for name, value in filters:
+            if name == 'category':
+                bit = {**CATEGORIES, **analyzer.domain_index.registry.bits}[value]
+                masks = analyzer.domain_index.masks
+                matches = map(bool, map(bit.__and__, map(masks.__getitem__, store.domain_ids)))
+            elif name == 'active':
+                matches = store.active_flags() if value else map(not_, store.active_flags())
+            elif name == 'where':
+                if state['index'] is None:
+                    state['index'] = SegmentIndex(analyzer)
+                matches = state['index'].selected(state['index'].evaluate(value))
+            else:
+                # Age in 30-day months from the analysis date; undated subscribers match no age filter
+                cutoff = to_epoch_seconds(analyzer.current_date) - int(value * 30 * SECONDS_PER_DAY)
+                if name == 'min_months':
+                    in_range = map(ge, repeat(cutoff), store.subscribed)  # Subscribed at or before the cutoff
+                else:
+                    in_range = map(gt, store.subscribed, repeat(cutoff))  # Subscribed after it
+                matches = map(min, map(gt, store.subscribed, repeat(UNPARSED_DATE)), in_range)
+            selected = bytes(map(min, selected, matches))
+        accumulator = ReportAccumulator(analyzer)
+        accumulator.update(store.take(list(compress(range(len(store)), selected))))
+        if len(state['segments']) >= SERVICE_CACHE_SIZE:
+            state['segments'].clear()
+        state['segments'][filters] = accumulator
+        return accumulator
+
+    def query(self, section: str, params: Dict[str, str]) -> dict:
+        """One report section over the subscribers matching the filter parameters"""
+        if section not in SECTION_COLUMNS:
+            raise KeyError(section)
+        state = self.current()
+        filters = self.parse_filters(params, state['analyzer'])
+        key = (section, filters)
+        result = state['results'].get(key)
+        if result is None:
+            accumulator = self.segment(state, filters)
+            result = {'section': section, 'filters': dict(filters),
+                      'subscribers': sum(accumulator.pairs.values()), 'result': getattr(accumulator, section)()}
+            if len(state['results']) >= SERVICE_CACHE_SIZE:
+                state['results'].clear()
+            state['results'][key] = result
+        return result
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """JSON endpoints: GET /, GET /sections/<section>?filters, POST /reload"""
+
+    service = None  # Set on the subclass made by serve()
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        try:
+            if url.path in ('/', '/sections'):
+                self._send(200, self.service.info())
+            elif url.path.startswith('/sections/'):
+                self._send(200, self.service.query(url.path[len('/sections/'):], params))
+            else:
+                self._send(404, {'error': f"no endpoint {url.path}"})
+        except KeyError as e:
+            self._send(404, {'error': f"unknown section {e.args[0]!r}"})
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != '/reload':
+            self._send(404, {'error': f"no endpoint {self.path}"})
+            return
+        # Answered at once; GET / shows when the new data is in, or why the reload failed
+        self.service.reload()
+        self._send(202, {'reloading': True, 'loaded_at': self.service.state['loaded_at'].isoformat(timespec='seconds')})
+
+    def log_message(self, format, *args):
+        print(f"{self.address_string()} - {format % args}", file=sys.stderr)
+
+
+def serve(service: AnalysisService, host: str = 'localhost', port: int = 8000):
+    """Answer HTTP queries against the service until interrupted, one thread per request"""
+    handler = type('ServiceHandler', (_ServiceHandler,), {'service': service})
+    with ThreadingHTTPServer((host, port), handler) as server:
+        print(f"Serving {service.csv_file} ({len(service.state['analyzer'].subscribers):,} subscribers) "
+              f"on http://{host}:{server.server_port}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
 
 
 def main():
-    # Configuration
-    csv_file = "full_email.csv"
-    output_file = "email_analysis_report.txt"
-    years_back = 6  # Configurable parameter
+    parser = argparse.ArgumentParser(description="Analyze a Substack email subscriber export")
+    parser.add_argument('csv_file', nargs='?', default="full_email.csv",
+                        help="Substack export with all columns (default: full_email.csv)")
+    parser.add_argument('-o', '--output', default="email_analysis_report.txt",
+                        help="Report file to write (default: email_analysis_report.txt)")
+    parser.add_argument('--json', metavar='FILE',
+                        help="Also write the report's results as a JSON document")
+    parser.add_argument('--tables', metavar='DIR',
+                        help="Also write the histograms and domain breakdowns as CSV tables in DIR")
+    parser.add_argument('--scores', metavar='FILE',
+                        help="Also write every subscriber's domain, categories, age bucket, 6-month open rate and "
+                             "engagement score to a CSV file")
+    parser.add_argument('--years-back', type=int, default=6,
+                        help="Years covered by the subscription age histograms (default: 6)")
+    parser.add_argument('--chunk-size', type=int, default=0, metavar='ROWS',
+                        help=f"Stream the CSV in chunks of ROWS rows with bounded memory "
+                             f"(e.g. {DEFAULT_CHUNK_SIZE}; default: load it whole)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Analyze byte ranges of the CSV on this many processes (default: 1)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"Do not read or write the parsed-export cache ({DEFAULT_CACHE_DIR} next to the CSV)")
+    parser.add_argument('--cache-size-mb', type=int, default=DEFAULT_CACHE_SIZE >> 20,
+                        help=f"Evict least recently used cache entries beyond this size (default: {DEFAULT_CACHE_SIZE >> 20})")
+    parser.add_argument('--incremental', nargs='?', const='', metavar='SNAPSHOT',
+                        help="Keep a snapshot of this run and only re-analyze subscribers added, changed or removed "
+                             "since the last one (default snapshot: <csv name>.snapshot in the cache directory); "
+                             "the CSV is still read in full, and unless rows were only appended the results are "
+                             "re-ordered in a pass over every subscriber")
+    parser.add_argument('--no-mmap', action='store_true',
+                        help="Read the CSV through the csv module instead of the memory-mapped tokenizer")
+    parser.add_argument('--sections', type=parse_sections, metavar='SECTION,...',
+                        help="Only compute and report these sections, parsing only the columns they read "
+                             f"(choose from {', '.join(SECTION_COLUMNS)})")
+    parser.add_argument('--age-histograms', type=age_view_widths, default=(),
+                        metavar='MONTHS,...', help="Add subscription age histograms with these bucket widths in months, "
+                                                   "e.g. 1,3,6")
+    parser.add_argument('--calendar-months', action='store_true',
+                        help="Bucket --age-histograms by calendar months instead of 30-day months")
+    parser.add_argument('--open-rate-edges', type=open_rate_buckets, metavar='EDGES',
+                        help="Open rate histogram bucket edges in percent, e.g. 0,1,5,10,25,50, "
+                             "or 'log' for doubling buckets (default: 10%% steps)")
+    parser.add_argument('--categories', action='append', default=[], metavar='FILE',
+                        help="Add the domain categories in a .csv, .json or .yaml file (repeatable); "
+                             "see CategoryRegistry.load for the format")
+    parser.add_argument('--batch', metavar='DIR_OR_MANIFEST',
+                        help="Analyze every .csv in a directory, or every export listed in a manifest file, "
+                             "writing one report each plus a rollup to --report-dir")
+    parser.add_argument('--jobs', type=int, default=min(4, os.cpu_count() or 1),
+                        help="Exports analyzed at once in --batch mode (default: up to 4)")
+    parser.add_argument('--report-dir', default="email_analysis_reports",
+                        help="Where --batch writes its reports (default: email_analysis_reports)")
+    parser.add_argument('--overlap-index', metavar='DIR',
+                        help="Add each analyzed publication's hashed subscriber list to this overlap index")
+    parser.add_argument('--overlap', metavar='NAME,NAME,...',
+                        help="Report subscriber overlap between publications in --overlap-index ('all' for every one)")
+    parser.add_argument('--estimate', action='store_true',
+                        help="Answer --overlap from HyperLogLog sketches instead of exact intersections")
+    parser.add_argument('--history', metavar='DB',
+                        help="Record every report metric of this run in an SQLite history database")
+    parser.add_argument('--trend', metavar='METRIC',
+                        help="Print the series of a metric (e.g. basic_stats.never_opened_fraction) from --history; "
+                             "a pattern such as 'basic_stats.*' lists matching metric names")
+    parser.add_argument('--publication', metavar='NAME',
+                        help="Limit --trend to one publication")
+    parser.add_argument('--serve', metavar='[HOST:]PORT',
+                        help="Load the export once and answer JSON queries over HTTP: GET /sections/<section>"
+                             "?category=&min_months=&max_months=&active=&where=, POST /reload")
+    parser.add_argument('--segment', metavar='FILTER',
+                        help="Only analyze the subscribers matching a filter such as "
+                             "'category = \"Fortune 100\" and age < 12 and open_rate < 20' (see parse_segment)")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="Write per-stage wall time, CPU time, rows/sec and peak memory growth as JSON")
+    args = parser.parse_args()
+    csv_file = args.csv_file
+    output_file = args.output
+
+    if args.trend:
+        if not args.history:
+            parser.error("--trend needs --history")
+        history = HistoryStore(args.history)
+        if any(char in args.trend for char in '*?['):
+            print('\n'.join(history.metrics(args.trend)))
+        else:
+            for publication, run_date, value in history.series(args.trend, args.publication):
+                print(f"{publication}\t{run_date}\t{value:g}")
+        history.close()
+        return
+
+    if args.overlap:
+        if not args.overlap_index:
+            parser.error("--overlap needs --overlap-index")
+        index = OverlapIndex(args.overlap_index)
+        names = index.names() if args.overlap == 'all' else args.overlap.split(',')
+        if len(names) < 2:
+            parser.error("--overlap needs at least two publications")
+        try:
+            print('\n'.join(index.report(names, estimate=args.estimate)))
+        except (OSError, ValueError) as e:
+            print(f"Error reading overlap index: {e}")
+            sys.exit(1)
+        return
+
+    registry = CategoryRegistry()
+    for path in args.categories:
+        try:
+            registry.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"could not load categories from {path}: {e}")
+
+    if args.segment is not None:
+        try:
+            check_segment(parse_segment(args.segment), args.years_back,
+                          (args.open_rate_edges or OPEN_RATE_BUCKETS).edges, {**CATEGORIES, **registry.bits})
+        except ValueError as e:
+            parser.error(f"--segment: {e}")
+        if args.batch:
+            parser.error("--batch analyzes whole lists and cannot be combined with --segment")
+        if args.chunk_size or args.workers > 1 or args.incremental is not None:
+            parser.error("--segment needs the export loaded whole, without --chunk-size, --workers or --incremental")
+        if args.history:
+            # History series are per publication; segment metrics recorded under its name would mix into them
+            parser.error("--history records the full list's metrics and cannot be combined with --segment")
+
+    if args.serve:
+        if args.sections:
+            parser.error("--serve answers any section on request and cannot be combined with --sections")
+        host, _, port = args.serve.rpartition(':')
+        if not port.isdigit():
+            parser.error(f"--serve needs a port number, not {args.serve!r}")
+        cache = None if args.no_cache else ExportCache.beside(csv_file, args.cache_size_mb << 20)
+        try:
+            service = AnalysisService(csv_file, years_back=args.years_back, cache=cache, use_mmap=not args.no_mmap,
+                                      age_views=args.age_histograms, calendar_months=args.calendar_months,
+                                      open_rate_buckets=args.open_rate_edges, registry=registry)
+        except FileNotFoundError:
+            print(f"Error: Could not find the file '{csv_file}'.")
+            sys.exit(1)
+        serve(service, host or 'localhost', int(port))
+        return
+
+    if args.batch:
+        if args.json or args.tables or args.scores:
+            parser.error("--json, --tables and --scores write a single export's outputs and cannot be combined with --batch")
+        try:
+            exports = find_exports(args.batch)
+        except FileNotFoundError:
+            print(f"Error: Could not find '{args.batch}'.")
+            sys.exit(1)
+        results = analyze_batch(exports, args.report_dir, args.years_back, jobs=args.jobs, chunk_size=args.chunk_size,
+                                cache_size=None if args.no_cache else args.cache_size_mb << 20,
+                                overlap_dir=args.overlap_index,
+                                history=HistoryStore(args.history) if args.history else None, registry=registry,
+                                sections=args.sections, age_views=args.age_histograms,
+                                calendar_months=args.calendar_months, open_rate_buckets=args.open_rate_edges,
+                                use_mmap=not args.no_mmap)
+        sys.exit(0 if len(results) == len(exports) else 1)
     
     # Run analysis
-    analyzer = EmailAnalyzer(csv_file, years_back)
+    cache = None if args.no_cache else ExportCache.beside(csv_file, args.cache_size_mb << 20)
+    incremental = args.incremental
+    if incremental == '':
+        incremental = os.path.join(os.path.dirname(os.path.abspath(csv_file)), DEFAULT_CACHE_DIR,
+                                   os.path.basename(csv_file) + '.snapshot')
+    analyzer = EmailAnalyzer(csv_file, args.years_back, chunk_size=args.chunk_size, workers=args.workers,
+                             cache=cache, incremental=incremental,
+                             profiler=StageProfiler() if args.profile else None, use_mmap=not args.no_mmap,
+                             age_views=args.age_histograms, calendar_months=args.calendar_months,
+                             open_rate_buckets=args.open_rate_edges, registry=registry, sections=args.sections,
+                             segment=args.segment)
     try:
-        analyzer.generate_report(output_file)
+        analyzer.generate_report(output_file, args.json, args.tables)
         print(f"\nReport saved to: {output_file}")
+        if args.json:
+            print(f"JSON report saved to: {args.json}")
+        if args.tables:
+            print(f"CSV tables saved to: {args.tables}")
+        if args.scores:
+            rows = analyzer.export_scores(args.scores)
+            print(f"Scores for {rows:,} subscribers saved to: {args.scores}")
+        if analyzer.profiler is not None:
+            analyzer.profiler.save(args.profile, csv_file=csv_file, rows=analyzer.rows_processed())
+            print(f"Profile saved to: {args.profile}")
+        if args.history:
+            history = HistoryStore(args.history)
+            history.record(publication_names([csv_file])[0], analyzer.current_date, section_metrics(analyzer.analyze(), analyzer.sections))
+            history.close()
+            print(f"Metrics recorded in: {args.history}")
+        if args.overlap_index:
+            name = publication_names([csv_file])[0]
+            OverlapIndex(args.overlap_index).add(PublicationHashes.from_export(name, csv_file, analyzer.domain_index,
+                                                                               use_mmap=analyzer.use_mmap))
+            print(f"Subscriber hashes for {name} added to: {args.overlap_index}")
     except FileNotFoundError:
         print(f"Error: Could not find the file '{csv_file}'. Please ensure it exists in the current directory.")
         sys.exit(1)
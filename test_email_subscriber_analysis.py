@@ -0,0 +1,92 @@
+"""Check that every way of reading an export gives the same report
+
+The export is small but awkward: CRLF line endings, quoted fields with commas, doubled
+quotes and embedded newlines, mixed and malformed dates, blank cells and repeated
+emails. Run with pytest.
+"""
+
+import contextlib
+import csv
+import io
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import email_subscriber_analysis as esa
+
+
+ROWS = 400
+NOW = datetime(2026, 1, 15, 12, 0, 0)
+FIELDNAMES = ['Email', 'Name', 'Subscription date', 'Email last opened at', 'Email receives (last 6 months)',
+              'Emails opened (last 6 months)', 'Notes']
+DOMAINS = (sorted(esa.PROMINENT_EDU_EMAILS)[:3] + sorted(esa.FORTUNE_100_EMAILS)[:3] + sorted(esa.MEDIA_EMAILS)[:2]
+           + ['@usda.gov', '@ohio.gov', '@cs.stanford.edu', '@gmail.com', '@proton.me'])
+NOTES = ['', 'plain', 'has, a comma', 'says "hi"', 'two\nlines', 'three\r\nlines,\nwith "quotes"', '\n']
+
+
+def _date(rng: random.Random) -> str:
+    when = NOW - timedelta(days=rng.randrange(-5, 8 * 365), seconds=rng.randrange(86400))
+    return rng.choice([
+        when.strftime('%Y-%m-%dT%H:%M:%S.123Z'),
+        when.strftime('%Y-%m-%d %H:%M:%S'),
+        when.strftime('%Y-%m-%d'),
+        '', 'not a date',
+    ])
+
+
+def write_export(path, line_ending: str = '\r\n', rows: int = ROWS, seed: int = 7):
+    """Write a deterministic export with the given line endings, returning its path"""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator=line_ending)
+        writer.writerow(FIELDNAMES)
+        for i in range(rows):
+            received = rng.choice([0, 0, 1, 5, 12, 26])
+            writer.writerow([
+                f"user{i % (rows - 20)}{rng.choice(DOMAINS)}",  # A few emails repeat
+                rng.choice(['A', 'B, Jr.', 'C "the third"']),
+                _date(rng),
+                rng.choice(['', _date(rng)]),
+                received,
+                rng.randrange(received + 1),
+                rng.choice(NOTES),
+            ])
+    return str(path)
+
+
+def report(csv_file: str, output_file: str, **options) -> str:
+    """Text report of one run, at a fixed analysis date"""
+    analyzer = esa.EmailAnalyzer(csv_file, **options)
+    analyzer.current_date = NOW
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.generate_report(output_file)
+    with open(output_file, encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('line_ending', ['\r\n', '\n'])
+@pytest.mark.parametrize('options', [
+    {'chunk_size': 7},
+    {'workers': 3},
+    {'workers': 3, 'chunk_size': 5},
+    {'use_mmap': False},
+    {'chunk_size': 7, 'use_mmap': False},
+    {'workers': 3, 'use_mmap': False},
+], ids=lambda options: ','.join(f"{key}={value}" for key, value in options.items()))
+def test_report_matches_in_memory_run(tmp_path, line_ending, options):
+    csv_file = write_export(tmp_path / 'export.csv', line_ending)
+    expected = report(csv_file, tmp_path / 'plain.txt')
+    assert report(csv_file, tmp_path / 'other.txt', **options) == expected
+
+
+def test_quoted_newlines_are_not_rows(tmp_path):
+    csv_file = write_export(tmp_path / 'export.csv')
+    text = report(csv_file, tmp_path / 'plain.txt')
+    assert f"Total Subscribers: {ROWS:,}\n" in text
+
+
+def test_line_endings_do_not_change_report(tmp_path):
+    crlf = report(write_export(tmp_path / 'crlf.csv', '\r\n'), tmp_path / 'crlf.txt')
+    lf = report(write_export(tmp_path / 'lf.csv', '\n'), tmp_path / 'lf.txt')
+    assert crlf.replace('crlf.csv', 'lf.csv') == lf